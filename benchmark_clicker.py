@@ -0,0 +1,188 @@
+import argparse
+import json
+import logging
+import platform
+import queue
+import sys
+import time
+from array import array
+from pathlib import Path
+
+import clicker
+
+
+DEFAULT_RATES = [1, 10, 100, 1000, 5000]
+START_BIND = {"name": "f1", "scan_code": 0x3B, "vk_code": 0x70}
+
+
+def base_config(**changes) -> dict:
+    cfg = clicker.default_config()
+    cfg["start_bind"] = dict(START_BIND)
+    cfg.update(changes)
+    return cfg
+
+
+def build_runtime(mode: str, rate: float, backend) -> "clicker.RuntimePlan":
+    cfg = base_config(output_mode="mouse", mouse_button="left")
+    if mode == "static":
+        cfg["cps_mode"] = "static"
+        cfg["static_cps"] = repr(float(rate))
+        cfg["static_variance"] = "0"
+    else:
+        cfg["cps_mode"] = "interval"
+        cfg["interval_hours"] = "0"
+        cfg["interval_minutes"] = "0"
+        cfg["interval_seconds"] = "0"
+        cfg["interval_milliseconds"] = str(max(1, int(round(1000.0 / float(rate)))))
+
+    runtime = clicker.build_runtime_plan(cfg, backend)
+    if not runtime.ok:
+        raise ValueError(runtime.error)
+    return runtime
+
+
+def percentile(sorted_values, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, int(round((pct / 100.0) * (len(sorted_values) - 1)))))
+    return float(sorted_values[idx])
+
+
+def collect_emissions(backend, stamps: array) -> None:
+    for t_ns, kind, _a, _b in backend.take_events():
+        if kind == clicker.EVENT_MOUSE_DOWN:
+            stamps.append(t_ns)
+
+
+def run_rate(mode: str, rate: float, duration: float, wait_strategy: str) -> dict:
+    backend = clicker.HeadlessInputBackend()
+    runtime = build_runtime(mode, rate, backend)
+    worker = clicker.ClickerWorker(lambda: runtime, queue.Queue(), backend=backend, wait_strategy=wait_strategy)
+    stamps = array("q")
+
+    try:
+        time.sleep(0.1)
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        worker.set_active(True, "benchmark")
+
+        deadline = wall_start + duration
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            time.sleep(min(1.0, deadline - now))
+            collect_emissions(backend, stamps)
+
+        worker.set_active(False, "benchmark")
+        wall_s = time.perf_counter() - wall_start
+        cpu_s = time.process_time() - cpu_start
+    finally:
+        worker.close()
+
+    collect_emissions(backend, stamps)
+    result = summarize(mode, rate, stamps, wall_s, cpu_s)
+    result["scheduler"] = worker.scheduler.stats()
+    result["start_latency"] = worker.latency.summary()
+    return result
+
+
+def summarize(mode: str, rate: float, stamps: array, wall_s: float, cpu_s: float) -> dict:
+    period_ns = 1e9 / float(rate)
+    count = len(stamps)
+
+    result = {
+        "mode": mode,
+        "target_cps": float(rate),
+        "events": count,
+        "wall_s": round(wall_s, 6),
+        "cpu_s": round(cpu_s, 6),
+        "cpu_pct": round((cpu_s / wall_s) * 100.0, 3) if wall_s > 0 else 0.0,
+    }
+
+    if count < 2:
+        result.update({"mean_cps": 0.0, "rate_error_pct": None, "jitter_us": None, "drift_ms": None})
+        return result
+
+    span_ns = stamps[-1] - stamps[0]
+    mean_cps = (count - 1) * 1e9 / span_ns if span_ns > 0 else 0.0
+
+    errors = sorted(abs((stamps[i] - stamps[i - 1]) - period_ns) for i in range(1, count))
+
+    t0 = stamps[0]
+    drift_end_ns = (stamps[-1] - t0) - (count - 1) * period_ns
+    drift_max_ns = max(abs((stamps[i] - t0) - i * period_ns) for i in range(count))
+
+    result.update({
+        "mean_cps": round(mean_cps, 3),
+        "rate_error_pct": round(((mean_cps - rate) / rate) * 100.0, 4),
+        "jitter_us": {
+            "p50": round(percentile(errors, 50) / 1000.0, 3),
+            "p95": round(percentile(errors, 95) / 1000.0, 3),
+            "p99": round(percentile(errors, 99) / 1000.0, 3),
+            "max": round(errors[-1] / 1000.0, 3),
+        },
+        "drift_ms": {
+            "end": round(drift_end_ns / 1e6, 4),
+            "max_abs": round(drift_max_ns / 1e6, 4),
+        },
+    })
+    return result
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Measure ClickerWorker timing accuracy on the headless input backend.",
+    )
+    parser.add_argument(
+        "--rates",
+        default=",".join(str(r) for r in DEFAULT_RATES),
+        help="Comma-separated CPS targets to sweep.",
+    )
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds to run each rate.")
+    parser.add_argument(
+        "--mode",
+        choices=["static", "interval"],
+        default="static",
+        help="Drive the worker through static_cps or interval_seconds.",
+    )
+    parser.add_argument(
+        "--wait-strategy",
+        choices=["hybrid", "timer"],
+        default=clicker.WAIT_STRATEGY,
+        help="Scheduler the worker uses between clicks.",
+    )
+    parser.add_argument("--output", default="", help="Write the JSON report here instead of stdout.")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    clicker.logger.setLevel(logging.WARNING)
+
+    rates = [float(r) for r in args.rates.split(",") if r.strip()]
+    results = []
+    for rate in rates:
+        print(f"benchmark: {args.mode} {rate:g} CPS for {args.duration:g}s ({args.wait_strategy})", file=sys.stderr)
+        results.append(run_rate(args.mode, rate, args.duration, args.wait_strategy))
+
+    report = {
+        "app": clicker.APP_NAME,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "backend": clicker.HeadlessInputBackend.name,
+        "duration_s": args.duration,
+        "wait_strategy": args.wait_strategy,
+        "results": results,
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
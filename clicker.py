@@ -1,37 +1,69 @@
-from logging.handlers import RotatingFileHandler
-from rich.logging import RichHandler
+import time
+
+STARTUP_T0 = time.perf_counter()
+
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 import ctypes.wintypes as wintypes
 from pathlib import Path
-from tkinter import ttk
-import tkinter as tk
-import subprocess
+from array import array
+import statistics
+import itertools
+import argparse
+import hashlib
+import bisect
+import atexit
+import heapq
+import mmap
+import struct
+import types
+import collections
+import concurrent.futures
+import functools
 import threading
-import keyboard
 import logging
 import ctypes
 import random
+import math
 import queue
-import time
-import copy
 import json
 import sys
 import os
 import re
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+np = None
+_numpy_tried = False
+_numpy_lock = threading.Lock()
+keyboard = None
+tk = None
+ttk = None
+filedialog = None
+
 DEBUG_MODE = None
-TRACE_HOTKEY_EVENTS = False
-TRACE_CLICK_EVENTS = False
+TRACE_ENABLED = False
+TRACE_CAPACITY = 65536
 
 LOG_TO_FILE = False
 LOG_FILE_MAX_BYTES = 1_000_000
 LOG_FILE_BACKUPS = 3
+LOG_SUMMARY_INTERVAL_S = 1.0
 
 UI_THEME_MODE = "system"
 WATCH_SYSTEM_THEME = True
 
+INPUT_BACKEND = "auto"
+IS_WINDOWS = sys.platform == "win32"
+
 APP_NAME = "The Best Auto Clicker OAT"
 CONFIG_DIR = Path(os.getenv("APPDATA", str(Path.home()))) / "TheBestAutoClickerOAT"
 CONFIG_PATH = CONFIG_DIR / "config.json"
+PROFILES_DIR = CONFIG_DIR / "profiles"
+RECORDINGS_DIR = CONFIG_DIR / "recordings"
+TRACES_DIR = CONFIG_DIR / "traces"
 LOG_PATH = CONFIG_DIR / "debug.log"
 
 INPUT_MOUSE = 0
@@ -50,11 +82,112 @@ MOUSEEVENTF_MIDDLEUP = 0x0040
 
 MAPVK_VSC_TO_VK_EX = 3
 
+BURST_PERIOD_THRESHOLD_S = 0.001
+BURST_TICK_S = 0.001
+BURST_MAX_CLICKS = 256
+
+SCHEDULER_DEFAULT_SPIN_S = 0.0015
+SCHEDULER_MIN_SPIN_S = 0.00005
+SCHEDULER_MAX_SPIN_S = 0.004
+SCHEDULER_CALIBRATION_SAMPLES = 32
+SCHEDULER_CALIBRATION_PROBE_S = 0.001
+SCHEDULER_SAMPLE_WINDOW = 256
+SCHEDULER_RECALIBRATE_EVERY = 128
+
+WAIT_STRATEGY = "hybrid"
+TIMER_MAX_WAIT_S = 0.05
+TIMER_RESOLUTION_MAX_PERIOD_S = 0.05
+
+VARIANCE_TICK_S = 0.25
+CURSOR_SAMPLE_INTERVAL_S = 0.01
+
+CONFIG_SAVE_DEBOUNCE_S = 0.4
+CONFIG_SAVE_MIN_INTERVAL_S = 1.0
+
+JITTER_DISTRIBUTIONS = ("uniform", "gaussian", "lognormal", "humanized")
+JITTER_CHUNK_CLICKS = 4096
+JITTER_FIRST_CHUNK_CLICKS = 64
+JITTER_NUMPY_MIN_CLICKS = 1024
+HUMANIZE_MAX_SIGMA = 0.25
+
+RECORDING_MAGIC = b"TBACREC1"
+RECORDING_VERSION = 1
+RECORDING_FLAG_ZSTD = 0x0001
+RECORDING_HEADER = struct.Struct("<8sHHIQ")
+RECORDING_RECORD = struct.Struct("<IBBHii")
+RECORDING_PAD = 0
+RECORDING_MAX_DELTA_US = 0xFFFFFFFF
+RECORDING_FLUSH_S = 0.25
+RECORDING_CHUNK_RECORDS = 4096
+RECORDING_ZSTD_LEVEL = 3
+RECORDING_COMPRESS = False
+
+PLAYBACK_BATCH_WINDOW_US = 250
+PLAYBACK_MAX_BATCH = 256
+PLAYBACK_REPEAT_GAP_S = 0.01
+
+WH_MOUSE_LL = 14
+WM_QUIT = 0x0012
+LLMHF_INJECTED = 0x00000001
+
+SEQUENCE_MAX_EVENTS = 1_000_000
+SEQUENCE_TOKEN_RE = re.compile(r"#[^\n]*|[{};\n]|[^{};\n#]+")
+
+TRACE_MAGIC = b"TBACTRC1"
+TRACE_VERSION = 1
+TRACE_HEADER = struct.Struct("<8sHHQQqq")
+TRACE_RECORD = struct.Struct("<qqqHHBB")
+TRACE_EMIT = 1
+TRACE_HOOK_DOWN = 2
+TRACE_HOOK_UP = 3
+TRACE_START = 4
+TRACE_STOP = 5
+TRACE_BLOCKED = 6
+TRACE_UNBLOCKED = 7
+TRACE_CONFIG = 8
+
+LATENCY_BUCKETS = 26
+LATENCY_LOG_EVERY = 50
+
+CREATE_WAITABLE_TIMER_HIGH_RESOLUTION = 0x00000002
+TIMER_ALL_ACCESS = 0x001F0003
+INFINITE = 0xFFFFFFFF
+CLOCK_MONOTONIC = 1
+TIMER_ABSTIME = 1
+
+EVENT_MOUSE_DOWN = 1
+EVENT_MOUSE_UP = 2
+EVENT_KEY_DOWN = 3
+EVENT_KEY_UP = 4
+EVENT_MOVE = 5
+
+INPUT_RELEASE_KINDS = {
+    EVENT_KEY_DOWN: EVENT_KEY_UP,
+    EVENT_KEY_UP: EVENT_KEY_UP,
+    EVENT_MOUSE_DOWN: EVENT_MOUSE_UP,
+    EVENT_MOUSE_UP: EVENT_MOUSE_UP,
+}
+
+MOUSE_BUTTON_CODES = {
+    "left": 1,
+    "right": 2,
+    "middle": 3,
+}
+
 if DEBUG_MODE is None:
     DEBUG_MODE = not getattr(sys, "frozen", False)
 
-def setup_logger():
+class LazyQueueHandler(QueueHandler):
+    def prepare(self, record):
+        return record
+
+
+def setup_logger(use_rich=True):
     logger = logging.getLogger("autoclicker")
+    for handler in logger.handlers:
+        listener = getattr(handler, "listener", None)
+        if listener is not None:
+            listener.stop()
     logger.handlers.clear()
     logger.setLevel(logging.DEBUG if DEBUG_MODE else logging.INFO)
     logger.propagate = False
@@ -64,6 +197,14 @@ def setup_logger():
         datefmt="%H:%M:%S",
     )
 
+    RichHandler = None
+    if use_rich:
+        try:
+            from rich.logging import RichHandler
+        except ImportError:
+            pass
+
+    handlers = []
     if RichHandler is not None:
         rich_handler = RichHandler(
             rich_tracebacks=True,
@@ -73,13 +214,14 @@ def setup_logger():
         )
         rich_handler.setLevel(logging.DEBUG if DEBUG_MODE else logging.INFO)
         rich_handler.setFormatter(logging.Formatter("%(message)s"))
-        logger.addHandler(rich_handler)
+        handlers.append(rich_handler)
     else:
         stream_handler = logging.StreamHandler()
         stream_handler.setLevel(logging.DEBUG if DEBUG_MODE else logging.INFO)
         stream_handler.setFormatter(file_fmt)
-        logger.addHandler(stream_handler)
+        handlers.append(stream_handler)
 
+    file_error = None
     if LOG_TO_FILE:
         try:
             CONFIG_DIR.mkdir(parents=True, exist_ok=True)
@@ -91,14 +233,53 @@ def setup_logger():
             )
             file_handler.setLevel(logging.DEBUG)
             file_handler.setFormatter(file_fmt)
-            logger.addHandler(file_handler)
-        except Exception:
-            logger.exception("Failed to initialize file logger")
+            handlers.append(file_handler)
+        except Exception as e:
+            file_error = e
 
+    queue_handler = LazyQueueHandler(queue.SimpleQueue())
+    queue_handler.listener = QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+    queue_handler.listener.start()
+    atexit.register(queue_handler.listener.stop)
+    logger.addHandler(queue_handler)
+
+    if file_error is not None:
+        logger.error("Failed to initialize file logger: %s", file_error)
     logger.info("%s logger initialized | DEBUG_MODE=%s", APP_NAME, DEBUG_MODE)
     return logger
 
-logger = setup_logger()
+
+def load_tk():
+    global tk, ttk, filedialog
+    if tk is None:
+        import tkinter as tk
+        from tkinter import filedialog, ttk
+    return tk
+
+
+def load_numpy():
+    global np, _numpy_tried
+    if np is None and not _numpy_tried:
+        with _numpy_lock:
+            if not _numpy_tried:
+                try:
+                    import numpy as np
+                except ImportError:
+                    logger.debug("numpy not installed, using pure-Python fallbacks")
+                _numpy_tried = True
+    return np
+
+
+def load_keyboard():
+    global keyboard
+    if keyboard is None:
+        try:
+            import keyboard
+        except ImportError:
+            return None
+    return keyboard
+
+logger = logging.getLogger("autoclicker")
 
 
 if hasattr(wintypes, "ULONG_PTR"):
@@ -122,6 +303,7 @@ def default_config():
         "cps_mode": "static",
         "static_cps": "12",
         "static_variance": "1",
+        "variance_mode": "uniform",
         "interval_hours": "0",
         "interval_minutes": "0",
         "interval_seconds": "0",
@@ -130,13 +312,48 @@ def default_config():
         "mouse_button": "left",
         "lock_cursor": False,
         "output_key": default_bind(),
+        "sequence_script": "",
+        "playback_file": "",
         "toggle_mode": "press",
         "start_bind": default_bind(),
         "stop_bind": default_bind(),
         "elevate_on_start": False,
+        "profile_name": "",
+        "profile_bind": default_bind(),
+        "record_bind": default_bind(),
+        "channels": [],
     }
 
 
+def merge_config(base, loaded):
+    for key, value in loaded.items():
+        if key not in base:
+            continue
+        if isinstance(base[key], dict) and isinstance(value, dict):
+            for inner_key, inner_val in value.items():
+                if inner_key in base[key]:
+                    base[key][inner_key] = inner_val
+        else:
+            base[key] = value
+    return base
+
+
+def load_config():
+    cfg = default_config()
+    try:
+        CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+        if CONFIG_PATH.exists():
+            loaded = json.loads(CONFIG_PATH.read_text(encoding="utf-8"))
+            if isinstance(loaded, dict):
+                merge_config(cfg, loaded)
+            logger.info("Config loaded from %s", CONFIG_PATH)
+        else:
+            logger.info("Config file not found, using defaults")
+    except Exception:
+        logger.exception("Failed to load config, using defaults")
+    return cfg
+
+
 def current_process_exe():
     try:
         buf = ctypes.create_unicode_buffer(32768)
@@ -174,7 +391,7 @@ def read_windows_app_theme():
 class HoverTip:
     def __init__(self, widget, text, delay_ms=450):
         self.widget = widget
-        self.text = str(text)
+        self.text = text if callable(text) else str(text)
         self.delay_ms = int(delay_ms)
         self._after_id = None
         self.tip = None
@@ -215,7 +432,8 @@ class HoverTip:
         bg = "#111111"
         fg = "#f2f2f2"
 
-        lbl = tk.Label(self.tip, text=self.text, justify="left", bg=bg, fg=fg, padx=10, pady=8)
+        text = self.text() if callable(self.text) else self.text
+        lbl = tk.Label(self.tip, text=text, justify="left", bg=bg, fg=fg, padx=10, pady=8)
         lbl.pack()
 
     def _hide(self):
@@ -228,7 +446,7 @@ class HoverTip:
 
 
 class WinFocus:
-    user32 = ctypes.WinDLL("user32", use_last_error=True)
+    user32 = ctypes.WinDLL("user32", use_last_error=True) if IS_WINDOWS else None
 
     class POINT(ctypes.Structure):
         _fields_ = [("x", wintypes.LONG), ("y", wintypes.LONG)]
@@ -237,30 +455,69 @@ class WinFocus:
         _fields_ = [("left", wintypes.LONG), ("top", wintypes.LONG), ("right", wintypes.LONG), ("bottom", wintypes.LONG)]
 
     @staticmethod
-    def is_cursor_in_window(hwnd: int) -> bool:
-        if not hwnd:
-            return False
-
-        fg = WinFocus.user32.GetForegroundWindow()
-        if fg != hwnd:
+    def foreground_window() -> int:
+        if WinFocus.user32 is None:
+            return 0
+        return int(WinFocus.user32.GetForegroundWindow() or 0)
+
+
+class WindowGuard:
+    def __init__(self, hwnd, backend, sample_interval_s=None):
+        self.hwnd = int(hwnd)
+        self.backend = backend
+        self.rect = None
+        self.focused = False
+        self.samples = 0
+        if sample_interval_s is None:
+            sample_interval_s = CURSOR_SAMPLE_INTERVAL_S
+        self._sample_interval_ns = int(sample_interval_s * 1e9)
+        self._next_sample_ns = 0
+        self._blocked = False
+
+    def update_geometry(self, left, top, width, height):
+        self.rect = (int(left), int(top), int(left) + int(width), int(top) + int(height))
+
+    def set_focused(self, focused):
+        self.focused = bool(focused)
+        self._next_sample_ns = 0
+
+    def is_cursor_in_window(self):
+        now = time.perf_counter_ns()
+        if now < self._next_sample_ns:
+            return self._blocked
+        self._next_sample_ns = now + self._sample_interval_ns
+        self._blocked = self._sample()
+        return self._blocked
+
+    def _sample(self):
+        self.samples += 1
+        rect = self.rect
+        if rect is None:
             return False
 
-        pt = WinFocus.POINT()
-        if not WinFocus.user32.GetCursorPos(ctypes.byref(pt)):
+        if WinFocus.user32 is not None:
+            if WinFocus.foreground_window() != self.hwnd:
+                return False
+        elif not self.focused:
             return False
 
-        rc = WinFocus.RECT()
-        if not WinFocus.user32.GetWindowRect(hwnd, ctypes.byref(rc)):
+        pos = self.backend.get_cursor_pos()
+        if pos is None:
             return False
 
-        return (rc.left <= pt.x <= rc.right) and (rc.top <= pt.y <= rc.bottom)
+        left, top, right, bottom = rect
+        x, y = pos
+        return (left <= x <= right) and (top <= y <= bottom)
 
 
 class WinTimer:
-    winmm = ctypes.WinDLL("winmm", use_last_error=True)
+    winmm = ctypes.WinDLL("winmm", use_last_error=True) if IS_WINDOWS else None
 
     @staticmethod
     def begin(period_ms=1):
+        if WinTimer.winmm is None:
+            logger.debug("timeBeginPeriod unavailable on this platform")
+            return
         try:
             result = WinTimer.winmm.timeBeginPeriod(int(period_ms))
             if result != 0:
@@ -272,6 +529,8 @@ class WinTimer:
 
     @staticmethod
     def end(period_ms=1):
+        if WinTimer.winmm is None:
+            return
         try:
             result = WinTimer.winmm.timeEndPeriod(int(period_ms))
             if result != 0:
@@ -319,6 +578,16 @@ class INPUT_UNION(ctypes.Union):
     ]
 
 
+class MSLLHOOKSTRUCT(ctypes.Structure):
+    _fields_ = [
+        ("pt", WinFocus.POINT),
+        ("mouseData", wintypes.DWORD),
+        ("flags", wintypes.DWORD),
+        ("time", wintypes.DWORD),
+        ("dwExtraInfo", ULONG_PTR),
+    ]
+
+
 class INPUT(ctypes.Structure):
     _anonymous_ = ("u",)
     _fields_ = [
@@ -327,27 +596,130 @@ class INPUT(ctypes.Structure):
     ]
 
 
-class WinInput:
-    user32 = ctypes.WinDLL("user32", use_last_error=True)
+class OutputBuffer:
+    __slots__ = ("output_mode", "code", "pair", "max_count", "native")
 
-    @staticmethod
-    def _send(inp):
-        sent = WinInput.user32.SendInput(1, ctypes.byref(inp), ctypes.sizeof(INPUT))
-        if sent != 1:
-            last_error = ctypes.get_last_error()
-            logger.error("SendInput failed | sent=%s | last_error=%s", sent, last_error)
-            return False
+    def __init__(self, output_mode, code, pair, max_count, native=None):
+        object.__setattr__(self, "output_mode", output_mode)
+        object.__setattr__(self, "code", code)
+        object.__setattr__(self, "pair", pair)
+        object.__setattr__(self, "max_count", int(max_count))
+        object.__setattr__(self, "native", native)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("OutputBuffer is immutable")
+
+
+class InputBackend:
+    name = "base"
+
+    def __init__(self):
+        self._output_buffers = {}
+
+    def send_events(self, events):
+        raise NotImplementedError
+
+    def get_cursor_pos(self):
+        raise NotImplementedError
+
+    def set_cursor_pos(self, x, y):
+        raise NotImplementedError
+
+    def map_vk(self, scan_code):
+        return 0
+
+    def send_key(self, scan_code, is_keyup=False):
+        kind = EVENT_KEY_UP if is_keyup else EVENT_KEY_DOWN
+        return self.send_events([(kind, int(scan_code), 0)])
+
+    def output_buffer(self, output_mode, code):
+        key = (output_mode, code)
+        buffer = self._output_buffers.get(key)
+        if buffer is None:
+            buffer = self._build_output_buffer(output_mode, code)
+            if buffer is not None:
+                self._output_buffers[key] = buffer
+        return buffer
+
+    def _build_output_buffer(self, output_mode, code):
+        if output_mode == "mouse":
+            button = MOUSE_BUTTON_CODES.get(code)
+            if button is None:
+                logger.error("Invalid mouse button: %s", code)
+                return None
+            pair = ((EVENT_MOUSE_DOWN, button, 0), (EVENT_MOUSE_UP, button, 0))
+        else:
+            scan = int(code)
+            pair = ((EVENT_KEY_DOWN, scan, 0), (EVENT_KEY_UP, scan, 0))
+        return OutputBuffer(output_mode, code, pair, BURST_MAX_CLICKS, self._prepare_native(pair, BURST_MAX_CLICKS))
+
+    def _prepare_native(self, pair, max_count):
+        return None
+
+    def prepare_events(self, events):
+        return tuple(events)
+
+    def send_prepared(self, prepared):
+        if not prepared:
+            return True
+        return self.send_events(prepared)
+
+    def _send_output(self, buffer, count):
+        return self.send_events(buffer.pair * count)
+
+    def _send_release(self, buffer):
+        return self.send_events(buffer.pair[1:])
+
+    def send_output(self, buffer, count=1):
+        remaining = max(1, int(count))
+        while remaining > 0:
+            n = min(remaining, buffer.max_count)
+            if not self._send_output(buffer, n):
+                if buffer.output_mode == "mouse":
+                    logger.warning("Click send failed; attempting forced mouse-up release")
+                else:
+                    logger.warning("Key tap send failed; attempting forced key-up release")
+                self._send_release(buffer)
+                return False
+            remaining -= n
         return True
 
-    @staticmethod
-    def _send_many(inputs):
+    def tap_key(self, scan_code, count=1):
+        buffer = self.output_buffer("keyboard", int(scan_code))
+        return self.send_output(buffer, count)
+
+    def click_mouse(self, button_name, count=1):
+        buffer = self.output_buffer("mouse", button_name)
+        if buffer is None:
+            return False
+        return self.send_output(buffer, count)
+
+
+class Win32InputBackend(InputBackend):
+    name = "win32"
+
+    MOUSE_FLAGS = {
+        MOUSE_BUTTON_CODES["left"]: (MOUSEEVENTF_LEFTDOWN, MOUSEEVENTF_LEFTUP),
+        MOUSE_BUTTON_CODES["right"]: (MOUSEEVENTF_RIGHTDOWN, MOUSEEVENTF_RIGHTUP),
+        MOUSE_BUTTON_CODES["middle"]: (MOUSEEVENTF_MIDDLEDOWN, MOUSEEVENTF_MIDDLEUP),
+    }
+
+    def __init__(self):
+        if not IS_WINDOWS:
+            raise OSError("Win32 input backend requires Windows")
+        super().__init__()
+        self.user32 = ctypes.WinDLL("user32", use_last_error=True)
+        self._input_size = ctypes.sizeof(INPUT)
+
+    def _send_many(self, inputs):
         if not inputs:
             return True
 
         arr_type = INPUT * len(inputs)
-        arr = arr_type(*inputs)
+        return self._send_array(arr_type(*inputs), len(inputs))
 
-        total = len(inputs)
+    def _send_array(self, arr, total):
+        size = self._input_size
         sent_total = 0
 
         for _ in range(3):
@@ -355,10 +727,7 @@ class WinInput:
             if remaining <= 0:
                 return True
 
-            slice_type = INPUT * remaining
-            slice_arr = slice_type(*arr[sent_total:])
-
-            sent = WinInput.user32.SendInput(remaining, ctypes.byref(slice_arr), ctypes.sizeof(INPUT))
+            sent = self.user32.SendInput(remaining, ctypes.byref(arr, sent_total * size), size)
             if sent <= 0:
                 last_error = ctypes.get_last_error()
                 logger.error("SendInput batch failed | sent=0/%s | last_error=%s", remaining, last_error)
@@ -382,115 +751,1244 @@ class WinInput:
         scan = raw & 0xFF
         return raw, scan, extended
 
-    @staticmethod
-    def map_vk(scan_code):
-        raw, scan, extended = WinInput._normalize_scan(scan_code)
+    def _build_input(self, kind, a, b):
+        inp = INPUT()
+        if kind == EVENT_KEY_DOWN or kind == EVENT_KEY_UP:
+            _, scan, extended = self._normalize_scan(a)
+            flags = KEYEVENTF_SCANCODE
+            if extended:
+                flags |= KEYEVENTF_EXTENDEDKEY
+            if kind == EVENT_KEY_UP:
+                flags |= KEYEVENTF_KEYUP
+            inp.type = INPUT_KEYBOARD
+            inp.ki = KEYBDINPUT(0, scan, flags, 0, 0)
+        elif kind == EVENT_MOUSE_DOWN or kind == EVENT_MOUSE_UP:
+            down_flag, up_flag = self.MOUSE_FLAGS[int(a)]
+            inp.type = INPUT_MOUSE
+            inp.mi = MOUSEINPUT(0, 0, 0, down_flag if kind == EVENT_MOUSE_DOWN else up_flag, 0, 0)
+        else:
+            raise ValueError(f"Unsupported input event kind: {kind}")
+        return inp
+
+    def _prepare_native(self, pair, max_count):
+        inputs = [self._build_input(kind, a, b) for kind, a, b in pair]
+        arr = (INPUT * (len(inputs) * max_count))()
+        for i in range(len(arr)):
+            arr[i] = inputs[i % len(inputs)]
+        release = (INPUT * 1)(inputs[-1])
+        return arr, release
+
+    def _send_output(self, buffer, count):
+        arr, _ = buffer.native
+        return self._send_array(arr, len(buffer.pair) * count)
+
+    def _send_release(self, buffer):
+        _, release = buffer.native
+        return self._send_array(release, 1)
+
+    def send_events(self, events):
+        inputs = []
+        for kind, a, b in events:
+            if kind == EVENT_MOVE:
+                if not self._send_many(inputs) or not self.set_cursor_pos(a, b):
+                    return False
+                inputs = []
+                continue
+            inputs.append(self._build_input(kind, a, b))
+        return self._send_many(inputs)
+
+    def prepare_events(self, events):
+        segments = []
+        inputs = []
+        for kind, a, b in events:
+            if kind == EVENT_MOVE:
+                if inputs:
+                    segments.append(((INPUT * len(inputs))(*inputs), len(inputs)))
+                    inputs = []
+                segments.append((None, (int(a), int(b))))
+                continue
+            inputs.append(self._build_input(kind, a, b))
+        if inputs:
+            segments.append(((INPUT * len(inputs))(*inputs), len(inputs)))
+        return tuple(segments)
+
+    def send_prepared(self, prepared):
+        for arr, arg in prepared:
+            if arr is None:
+                if not self.set_cursor_pos(*arg):
+                    return False
+            elif not self._send_array(arr, arg):
+                return False
+        return True
+
+    def map_vk(self, scan_code):
+        raw, scan, extended = self._normalize_scan(scan_code)
         scan_for_map = ((0xE0 << 8) | scan) if extended else scan
-        vk = WinInput.user32.MapVirtualKeyW(scan_for_map, MAPVK_VSC_TO_VK_EX)
+        vk = self.user32.MapVirtualKeyW(scan_for_map, MAPVK_VSC_TO_VK_EX)
         return int(vk)
 
-    @staticmethod
-    def get_cursor_pos():
+    def get_cursor_pos(self):
         pt = WinFocus.POINT()
-        if not WinInput.user32.GetCursorPos(ctypes.byref(pt)):
+        if not self.user32.GetCursorPos(ctypes.byref(pt)):
             return None
         return int(pt.x), int(pt.y)
 
-    @staticmethod
-    def set_cursor_pos(x, y):
-        return bool(WinInput.user32.SetCursorPos(int(x), int(y)))
+    def set_cursor_pos(self, x, y):
+        return bool(self.user32.SetCursorPos(int(x), int(y)))
 
-    @staticmethod
-    def send_key(scan_code, is_keyup=False):
-        raw, scan, extended = WinInput._normalize_scan(scan_code)
-        flags = KEYEVENTF_SCANCODE
-        if extended:
-            flags |= KEYEVENTF_EXTENDEDKEY
-        if is_keyup:
-            flags |= KEYEVENTF_KEYUP
 
-        inp = INPUT()
-        inp.type = INPUT_KEYBOARD
-        inp.ki = KEYBDINPUT(0, scan, flags, 0, 0)
+class HeadlessInputBackend(InputBackend):
+    name = "headless"
 
-        if TRACE_CLICK_EVENTS and DEBUG_MODE:
-            logger.debug("Send key | scan=0x%X | keyup=%s | extended=%s", raw, is_keyup, extended)
+    def __init__(self, record=True):
+        super().__init__()
+        self.record = bool(record)
+        self.events = []
+        self.cursor = (0, 0)
 
-        return WinInput._send(inp)
+    def send_events(self, events):
+        t_ns = time.perf_counter_ns()
+        for kind, a, b in events:
+            if kind == EVENT_MOVE:
+                self.cursor = (int(a), int(b))
+            if self.record:
+                self.events.append((t_ns, kind, a, b))
+        return True
 
-    @staticmethod
-    def tap_key(scan_code):
-        raw, scan, extended = WinInput._normalize_scan(scan_code)
-        flags_down = KEYEVENTF_SCANCODE | (KEYEVENTF_EXTENDEDKEY if extended else 0)
-        flags_up = flags_down | KEYEVENTF_KEYUP
+    def take_events(self):
+        events = self.events
+        self.events = []
+        return events
 
-        inp_down = INPUT()
-        inp_down.type = INPUT_KEYBOARD
-        inp_down.ki = KEYBDINPUT(0, scan, flags_down, 0, 0)
+    def get_cursor_pos(self):
+        return self.cursor
 
-        inp_up = INPUT()
-        inp_up.type = INPUT_KEYBOARD
-        inp_up.ki = KEYBDINPUT(0, scan, flags_up, 0, 0)
+    def set_cursor_pos(self, x, y):
+        self.cursor = (int(x), int(y))
+        return True
 
-        ok = WinInput._send_many([inp_down, inp_up])
-        if ok:
-            return True
 
-        logger.warning("Key tap send failed; attempting forced key-up release")
-        WinInput._send(inp_up)
+def create_input_backend(name=None):
+    name = str(name or INPUT_BACKEND or "auto").lower()
+    if name == "auto":
+        name = "win32" if IS_WINDOWS else "headless"
+
+    if name == "win32":
+        backend = Win32InputBackend()
+    elif name == "headless":
+        backend = HeadlessInputBackend()
+    else:
+        raise ValueError(f"Unknown input backend: {name}")
+
+    logger.debug("Input backend selected: %s", backend.name)
+    return backend
+
+
+class TraceRing:
+    def __init__(self, capacity=TRACE_CAPACITY, enabled=False):
+        capacity = 1 << max(1, int(capacity) - 1).bit_length()
+        self.capacity = capacity
+        self._mask = capacity - 1
+        self.ts = array("q", bytes(8 * capacity))
+        self.scheduled = array("q", bytes(8 * capacity))
+        self.actual = array("q", bytes(8 * capacity))
+        self.code = array("H", bytes(2 * capacity))
+        self.count = array("H", bytes(2 * capacity))
+        self.kind = array("B", bytes(capacity))
+        self.channel = array("B", bytes(capacity))
+        self._seq = itertools.count()
+        self.head = 0
+        self.enabled = bool(enabled)
+
+    def clear(self):
+        self._seq = itertools.count()
+        self.head = 0
+
+    def record(self, kind, code=0, scheduled_ns=0, actual_ns=0, count=1, channel=0):
+        seq = next(self._seq)
+        i = seq & self._mask
+        self.ts[i] = time.perf_counter_ns()
+        self.scheduled[i] = scheduled_ns
+        self.actual[i] = actual_ns
+        self.code[i] = code & 0xFFFF
+        self.count[i] = min(count, 0xFFFF)
+        self.kind[i] = kind
+        self.channel[i] = channel & 0xFF
+        self.head = seq + 1
+
+    def dump(self, path):
+        head = self.head
+        start = max(0, head - self.capacity)
+        size = TRACE_RECORD.size
+        chunk = bytearray(size * 4096)
+        view = memoryview(chunk)
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(".tmp")
+        with open(temp_path, "wb") as f:
+            f.write(TRACE_HEADER.pack(TRACE_MAGIC, TRACE_VERSION, size, head - start, start, time.time_ns(), time.perf_counter_ns()))
+            n = 0
+            for seq in range(start, head):
+                i = seq & self._mask
+                TRACE_RECORD.pack_into(
+                    chunk,
+                    n * size,
+                    self.ts[i],
+                    self.scheduled[i],
+                    self.actual[i],
+                    self.code[i],
+                    self.count[i],
+                    self.kind[i],
+                    self.channel[i],
+                )
+                n += 1
+                if n == 4096:
+                    f.write(view)
+                    n = 0
+            f.write(view[: n * size])
+        temp_path.replace(path)
+        logger.info("Trace dumped | %s | records=%s | overwritten=%s", path, head - start, start)
+        return head - start
+
+
+trace = TraceRing(TRACE_CAPACITY, TRACE_ENABLED)
+
+
+class StartupProfiler:
+    __slots__ = ("phases", "_last")
+
+    def __init__(self, t0):
+        self.phases = []
+        self._last = t0
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+
+    def summary(self):
+        total = sum(elapsed for _phase, elapsed in self.phases)
+        parts = " | ".join(f"{phase}={elapsed * 1000.0:.1f}ms" for phase, elapsed in self.phases)
+        return f"total={total * 1000.0:.1f}ms | {parts}"
+
+
+startup = StartupProfiler(STARTUP_T0)
+
+
+def _percentile(ordered, pct):
+    if not ordered:
+        return 0.0
+    return ordered[int(pct * (len(ordered) - 1))]
+
+
+class HybridScheduler:
+    name = "hybrid"
+    needs_timer_resolution = True
+
+    def __init__(self):
+        self.spin_threshold_s = SCHEDULER_DEFAULT_SPIN_S
+        self._overshoots = collections.deque(maxlen=SCHEDULER_SAMPLE_WINDOW)
+        self._samples_since_update = 0
+        self.timer_resolution = False
+        self._saved = {}
+        self._probe = threading.Event()
+        self.sleeps = 0
+        self.spin_waits = 0
+        self.spin_time_s = 0.0
+        self.calibrations = 0
+
+    def calibrate(self, samples=SCHEDULER_CALIBRATION_SAMPLES, probe_s=SCHEDULER_CALIBRATION_PROBE_S):
+        for _ in range(int(samples)):
+            t0 = time.perf_counter()
+            self._probe.wait(probe_s)
+            self._overshoots.append(max(0.0, time.perf_counter() - t0 - probe_s))
+        self._update_threshold()
+        logger.debug("Scheduler calibrated | spin_threshold=%.1fus", self.spin_threshold_s * 1e6)
+
+    def use_timer_resolution(self, held):
+        held = bool(held) and WinTimer.winmm is not None
+        if held == self.timer_resolution:
+            return
+        self._saved[self.timer_resolution] = (self.spin_threshold_s, self._overshoots, self._samples_since_update)
+        self.timer_resolution = held
+        saved = self._saved.get(held)
+        if saved is not None:
+            self.spin_threshold_s, self._overshoots, self._samples_since_update = saved
+            return
+        self._overshoots = collections.deque(maxlen=SCHEDULER_SAMPLE_WINDOW)
+        self._samples_since_update = 0
+        self.calibrate()
+
+    def close(self):
+        pass
+
+    def _update_threshold(self):
+        self._samples_since_update = 0
+        if not self._overshoots:
+            return
+        p99 = _percentile(sorted(self._overshoots), 0.99)
+        self.spin_threshold_s = min(SCHEDULER_MAX_SPIN_S, max(SCHEDULER_MIN_SPIN_S, p99 * 1.25))
+        self.calibrations += 1
+
+    def wait_until(self, deadline, interrupted, wake_event=None):
+        while not interrupted():
+            now = time.perf_counter()
+            remaining = deadline - now
+            if remaining <= 0:
+                return True
+
+            if remaining > self.spin_threshold_s:
+                requested = remaining - self.spin_threshold_s
+                if wake_event is None:
+                    wake_event = self._probe
+                if wake_event.wait(requested):
+                    wake_event.clear()
+                    continue
+                self.sleeps += 1
+                self._overshoots.append(max(0.0, time.perf_counter() - now - requested))
+                self._samples_since_update += 1
+                if self._samples_since_update >= SCHEDULER_RECALIBRATE_EVERY:
+                    self._update_threshold()
+                continue
+
+            self.spin_waits += 1
+            while time.perf_counter() < deadline:
+                if interrupted():
+                    break
+                time.sleep(0)
+            self.spin_time_s += time.perf_counter() - now
         return False
 
-    @staticmethod
-    def click_mouse(button_name):
-        if TRACE_CLICK_EVENTS and DEBUG_MODE:
-            logger.debug("Click mouse | button=%s", button_name)
-
-        if button_name == "left":
-            down_flag, up_flag = MOUSEEVENTF_LEFTDOWN, MOUSEEVENTF_LEFTUP
-        elif button_name == "right":
-            down_flag, up_flag = MOUSEEVENTF_RIGHTDOWN, MOUSEEVENTF_RIGHTUP
-        elif button_name == "middle":
-            down_flag, up_flag = MOUSEEVENTF_MIDDLEDOWN, MOUSEEVENTF_MIDDLEUP
+    def stats(self):
+        ordered = sorted(self._overshoots)
+        return {
+            "strategy": self.name,
+            "spin_threshold_us": round(self.spin_threshold_s * 1e6, 1),
+            "overshoot_p50_us": round(_percentile(ordered, 0.50) * 1e6, 1),
+            "overshoot_p99_us": round(_percentile(ordered, 0.99) * 1e6, 1),
+            "overshoot_max_us": round(_percentile(ordered, 1.0) * 1e6, 1),
+            "samples": len(ordered),
+            "calibrations": self.calibrations,
+            "sleeps": self.sleeps,
+            "spin_waits": self.spin_waits,
+            "spin_time_s": round(self.spin_time_s, 6),
+        }
+
+
+class timespec(ctypes.Structure):
+    _fields_ = [("tv_sec", ctypes.c_long), ("tv_nsec", ctypes.c_long)]
+
+
+class WaitableTimerScheduler:
+    name = "timer"
+    needs_timer_resolution = False
+
+    def __init__(self):
+        self.waits = 0
+        self._lateness = collections.deque(maxlen=SCHEDULER_SAMPLE_WINDOW)
+        self._kernel32 = None
+        self._handle = None
+        self._clock_nanosleep = None
+        self.mechanism = "sleep"
+
+        if IS_WINDOWS:
+            try:
+                self._kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+                self._kernel32.CreateWaitableTimerExW.restype = wintypes.HANDLE
+                self._kernel32.CreateWaitableTimerW.restype = wintypes.HANDLE
+                handle = self._kernel32.CreateWaitableTimerExW(
+                    None, None, CREATE_WAITABLE_TIMER_HIGH_RESOLUTION, TIMER_ALL_ACCESS
+                )
+                if handle:
+                    self.mechanism = "waitable_timer_high_resolution"
+                else:
+                    handle = self._kernel32.CreateWaitableTimerW(None, True, None)
+                    if handle:
+                        self.mechanism = "waitable_timer"
+                self._handle = handle or None
+            except Exception as e:
+                logger.debug("Waitable timer unavailable, falling back to sleep | %s", e)
         else:
-            logger.error("Invalid mouse button: %s", button_name)
-            return False
+            try:
+                libc = ctypes.CDLL(None, use_errno=True)
+                self._clock_nanosleep = libc.clock_nanosleep
+                self._clock_nanosleep.argtypes = [
+                    ctypes.c_int,
+                    ctypes.c_int,
+                    ctypes.POINTER(timespec),
+                    ctypes.POINTER(timespec),
+                ]
+                self.mechanism = "clock_nanosleep"
+            except Exception as e:
+                logger.debug("clock_nanosleep unavailable, falling back to sleep | %s", e)
 
-        inp_down = INPUT()
-        inp_down.type = INPUT_MOUSE
-        inp_down.mi = MOUSEINPUT(0, 0, 0, down_flag, 0, 0)
+        logger.debug("Timer scheduler ready | mechanism=%s", self.mechanism)
 
-        inp_up = INPUT()
-        inp_up.type = INPUT_MOUSE
-        inp_up.mi = MOUSEINPUT(0, 0, 0, up_flag, 0, 0)
+    def calibrate(self, *args, **kwargs):
+        pass
+
+    def use_timer_resolution(self, held):
+        pass
+
+    def close(self):
+        if self._handle is not None:
+            try:
+                self._kernel32.CloseHandle(self._handle)
+            except Exception as e:
+                logger.debug("CloseHandle failed for waitable timer | %s", e)
+            self._handle = None
+
+    def _wait_chunk(self, deadline):
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            return
+
+        if self._handle is not None:
+            due = ctypes.c_longlong(-max(1, int(remaining * 10_000_000)))
+            if self._kernel32.SetWaitableTimer(self._handle, ctypes.byref(due), 0, None, None, False):
+                self._kernel32.WaitForSingleObject(self._handle, INFINITE)
+                return
+
+        if self._clock_nanosleep is not None:
+            target_ns = time.clock_gettime_ns(CLOCK_MONOTONIC) + int(remaining * 1e9)
+            ts = timespec(target_ns // 1_000_000_000, target_ns % 1_000_000_000)
+            self._clock_nanosleep(CLOCK_MONOTONIC, TIMER_ABSTIME, ctypes.byref(ts), None)
+            return
+
+        time.sleep(remaining)
+
+    def wait_until(self, deadline, interrupted, wake_event=None):
+        while not interrupted():
+            now = time.perf_counter()
+            if now >= deadline:
+                return True
+
+            if wake_event is not None and deadline - now > TIMER_MAX_WAIT_S:
+                if wake_event.wait(deadline - now - TIMER_MAX_WAIT_S):
+                    wake_event.clear()
+                continue
+
+            chunk_end = min(deadline, now + TIMER_MAX_WAIT_S)
+            self._wait_chunk(chunk_end)
+            self.waits += 1
+            if chunk_end == deadline:
+                self._lateness.append(max(0.0, time.perf_counter() - deadline))
+        return False
+
+    def stats(self):
+        ordered = sorted(self._lateness)
+        return {
+            "strategy": self.name,
+            "mechanism": self.mechanism,
+            "lateness_p50_us": round(_percentile(ordered, 0.50) * 1e6, 1),
+            "lateness_p99_us": round(_percentile(ordered, 0.99) * 1e6, 1),
+            "lateness_max_us": round(_percentile(ordered, 1.0) * 1e6, 1),
+            "samples": len(ordered),
+            "waits": self.waits,
+        }
 
-        ok = WinInput._send_many([inp_down, inp_up])
-        if ok:
-            return True
 
-        logger.warning("Click send failed; attempting forced mouse-up release")
-        WinInput._send(inp_up)
+def create_scheduler(name=None):
+    name = str(name or WAIT_STRATEGY or "hybrid").lower()
+    if name == "hybrid":
+        return HybridScheduler()
+    if name == "timer":
+        return WaitableTimerScheduler()
+    raise ValueError(f"Unknown wait strategy: {name}")
+
+
+class LatencyTracker:
+    PHASES = ("hook", "set_active", "wake", "runtime", "emit")
+    SEGMENTS = (
+        ("hook_to_set_active", 0, 1),
+        ("set_active_to_wake", 1, 2),
+        ("wake_to_runtime", 2, 3),
+        ("runtime_to_emit", 3, 4),
+        ("total", 0, 4),
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = None
+        self.activations = 0
+        self._histograms = {name: [0] * LATENCY_BUCKETS for name, _, _ in self.SEGMENTS}
+        self._max_ns = {name: 0 for name, _, _ in self.SEGMENTS}
+        self._sum_ns = {name: 0 for name, _, _ in self.SEGMENTS}
+        self._count = {name: 0 for name, _, _ in self.SEGMENTS}
+
+    def begin(self, hook_ns=None):
+        now = time.perf_counter_ns()
+        self._pending = [int(hook_ns) if hook_ns else now, now, 0, 0, 0]
+
+    def cancel(self):
+        self._pending = None
+
+    def mark(self, phase_index):
+        marks = self._pending
+        if marks is not None and not marks[phase_index]:
+            marks[phase_index] = time.perf_counter_ns()
+
+    def finish(self):
+        marks = self._pending
+        if marks is None:
+            return None
+        self._pending = None
+        marks[4] = time.perf_counter_ns()
+        for i in (2, 3):
+            if not marks[i]:
+                marks[i] = marks[i - 1]
+
+        with self._lock:
+            self.activations += 1
+            for name, a, b in self.SEGMENTS:
+                delta = max(0, marks[b] - marks[a])
+                bucket = min(LATENCY_BUCKETS - 1, (delta // 1000).bit_length())
+                self._histograms[name][bucket] += 1
+                self._sum_ns[name] += delta
+                self._count[name] += 1
+                if delta > self._max_ns[name]:
+                    self._max_ns[name] = delta
+            activations = self.activations
+
+        total_ns = marks[4] - marks[0]
+        logger.debug("Start-to-first-click latency: %.1fus", total_ns / 1000.0)
+        if activations % LATENCY_LOG_EVERY == 0:
+            logger.info("Activation latency | %s", self.format_summary())
+        return total_ns
+
+    def _bucket_percentile_us(self, hist, count, pct):
+        target = pct * count
+        seen = 0
+        for i, n in enumerate(hist):
+            seen += n
+            if n and seen >= target:
+                return 0 if i == 0 else (1 << i) - 1
+        return 0
+
+    def summary(self):
+        with self._lock:
+            out = {"activations": self.activations}
+            for name, _, _ in self.SEGMENTS:
+                count = self._count[name]
+                hist = list(self._histograms[name])
+                out[name] = {
+                    "count": count,
+                    "mean_us": round(self._sum_ns[name] / count / 1000.0, 1) if count else 0.0,
+                    "p50_us_le": self._bucket_percentile_us(hist, count, 0.50),
+                    "p99_us_le": self._bucket_percentile_us(hist, count, 0.99),
+                    "max_us": round(self._max_ns[name] / 1000.0, 1),
+                    "histogram_log2_us": hist,
+                }
+        return out
+
+    def format_summary(self):
+        data = self.summary()
+        if not data["activations"]:
+            return "no activations yet"
+        parts = []
+        for name, _, _ in self.SEGMENTS:
+            seg = data[name]
+            parts.append(f"{name} mean={seg['mean_us']}us p99<={seg['p99_us_le']}us max={seg['max_us']}us")
+        return f"n={data['activations']} | " + " | ".join(parts)
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return types.MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value):
+    if isinstance(value, types.MappingProxyType):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+
+class ConfigSnapshot:
+    __slots__ = ("version", "data")
+
+    def __init__(self, data, version=0):
+        object.__setattr__(self, "version", int(version))
+        object.__setattr__(self, "data", _freeze(dict(data)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ConfigSnapshot is immutable")
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def __contains__(self, key):
+        return key in self.data
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def to_dict(self):
+        return _thaw(self.data)
+
+    def replace(self, **changes):
+        changed = {k: v for k, v in changes.items() if _freeze(v) != self.data.get(k)}
+        if not changed:
+            return self
+        merged = dict(self.data)
+        merged.update(changed)
+        return ConfigSnapshot(merged, self.version + 1)
+
+
+def parse_float(text_value, field_name, minimum=None):
+    try:
+        value = float(str(text_value).strip())
+    except Exception:
+        return False, f"{field_name} must be a number"
+    if minimum is not None and value < minimum:
+        return False, f"{field_name} must be >= {minimum}"
+    return True, value
+
+
+def parse_int(text_value, field_name, minimum=None):
+    try:
+        value = int(str(text_value).strip() or "0")
+    except Exception:
+        return False, f"{field_name} must be an integer"
+    if minimum is not None and value < minimum:
+        return False, f"{field_name} must be >= {minimum}"
+    return True, value
+
+
+def bind_scan(bind):
+    if isinstance(bind, (dict, types.MappingProxyType)):
+        scan = bind.get("scan_code")
+        if isinstance(scan, int) and not isinstance(scan, bool):
+            return scan
+    return None
+
+
+def bind_same(a, b):
+    if not a or not b:
         return False
+    return a.get("scan_code") is not None and a.get("scan_code") == b.get("scan_code")
+
+
+class FixedPeriodSource:
+    __slots__ = ("period",)
+
+    def __init__(self, period):
+        self.period = float(period)
+
+    def __call__(self, now):
+        return self.period
+
+
+class JitterEngine:
+    def __init__(self, base, var, distribution):
+        self.base = float(base)
+        self.var = float(var)
+        self.distribution = distribution
+        self.integer_var = self.var.is_integer()
+        self.humanize_sigma = min(HUMANIZE_MAX_SIGMA, 0.5 * self.var / self.base)
+        self.clicks_per_tick = max(1, int(round(VARIANCE_TICK_S * self.base)))
+        self.ticks_per_chunk = max(1, -(-JITTER_CHUNK_CLICKS // self.clicks_per_tick))
+        self._rng = random.Random()
+        self._np_rng = None
+
+    def generate(self, ticks=None):
+        ticks = self.ticks_per_chunk if ticks is None else max(1, int(ticks))
+        if ticks * self.clicks_per_tick >= JITTER_NUMPY_MIN_CLICKS and load_numpy() is not None:
+            if self._np_rng is None:
+                self._np_rng = np.random.default_rng()
+            chunk = self._generate_numpy(ticks)
+        else:
+            chunk = self._generate_python(ticks)
+        logger.debug(
+            "Jitter chunk generated | dist=%s | clicks=%s | mean_cps=%.3f",
+            self.distribution,
+            len(chunk),
+            len(chunk) / max(1e-9, sum(chunk)),
+        )
+        return chunk
+
+    def _generate_numpy(self, n):
+        rng = self._np_rng
+        base, var = self.base, self.var
+
+        if self.distribution == "uniform":
+            if self.integer_var:
+                delta = rng.integers(-int(var), int(var) + 1, n)
+            else:
+                delta = rng.uniform(-var, var, n)
+            cps = base + delta
+        elif self.distribution == "lognormal":
+            sigma = np.log1p(var / base) / 2.0
+            cps = np.clip(base * rng.lognormal(-(sigma * sigma) / 2.0, sigma, n), base - var, base + var)
+        else:
+            cps = base + np.clip(rng.normal(0.0, var / 2.0, n), -var, var)
+
+        cps = np.maximum(cps, 0.001)
+        counts = np.maximum(1, np.rint(VARIANCE_TICK_S * cps)).astype(np.int64)
+        periods = np.repeat(1.0 / cps, counts)
+
+        if self.distribution == "humanized" and self.humanize_sigma > 0:
+            sigma = self.humanize_sigma
+            periods *= rng.lognormal(-(sigma * sigma) / 2.0, sigma, len(periods))
+
+        out = array("d")
+        out.frombytes(periods.astype(np.float64).tobytes())
+        return out
+
+    def _generate_python(self, n):
+        rng = self._rng
+        base, var = self.base, self.var
+        out = array("d")
+
+        for _ in range(n):
+            if self.distribution == "uniform":
+                if self.integer_var:
+                    cps = base + rng.randint(-int(var), int(var))
+                else:
+                    cps = base + rng.uniform(-var, var)
+            elif self.distribution == "lognormal":
+                sigma = math.log1p(var / base) / 2.0
+                mu = -(sigma * sigma) / 2.0
+                cps = min(base + var, max(base - var, base * rng.lognormvariate(mu, sigma)))
+            else:
+                cps = base + min(var, max(-var, rng.gauss(0.0, var / 2.0)))
+
+            cps = max(0.001, cps)
+            period = 1.0 / cps
+            count = max(1, int(round(VARIANCE_TICK_S * cps)))
+
+            if self.distribution == "humanized" and self.humanize_sigma > 0:
+                sigma = self.humanize_sigma
+                mu = -(sigma * sigma) / 2.0
+                out.extend(period * rng.lognormvariate(mu, sigma) for _ in range(count))
+            else:
+                out.extend([period] * count)
+        return out
+
+
+class JitterRefiller:
+    _executor = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def submit(cls, engine):
+        with cls._lock:
+            if cls._executor is None:
+                cls._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=1,
+                    thread_name_prefix="jitter-refill",
+                )
+            return cls._executor.submit(engine.generate)
+
+
+class JitterPeriodSource:
+    __slots__ = ("engine", "buffer", "index", "pending")
+
+    def __init__(self, base, var, distribution):
+        self.engine = JitterEngine(base, var, distribution)
+        self.buffer = self.engine.generate(JITTER_FIRST_CHUNK_CLICKS // self.engine.clicks_per_tick)
+        self.index = 0
+        self.pending = JitterRefiller.submit(self.engine)
+
+    def __call__(self, now):
+        i = self.index
+        if i >= len(self.buffer):
+            self.buffer = self.pending.result()
+            self.pending = JitterRefiller.submit(self.engine)
+            i = 0
+        self.index = i + 1
+        return self.buffer[i]
+
+
+class HeldInputs:
+    __slots__ = ("backend", "held")
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.held = {}
+
+    def track(self, events):
+        held = self.held
+        for kind, code, _ in events:
+            release = INPUT_RELEASE_KINDS.get(kind)
+            if release is None:
+                continue
+            if kind == release:
+                held.pop((release, code), None)
+            else:
+                held[(release, code)] = None
+
+    def release(self):
+        if not self.held:
+            return True
+        events = [(kind, code, 0) for kind, code in self.held]
+        self.held = {}
+        logger.debug("Releasing held inputs | %s", len(events))
+        return self.backend.send_events(events)
+
+
+class SequenceTimeline:
+    __slots__ = ("kinds", "arg_a", "arg_b", "starts", "gaps", "prepared", "holds", "backend")
+
+    def __init__(self, kinds, arg_a, arg_b, starts, gaps, backend):
+        self.kinds = kinds
+        self.arg_a = arg_a
+        self.arg_b = arg_b
+        self.starts = starts
+        self.gaps = gaps
+        self.backend = backend
+        self.prepared = tuple(
+            backend.prepare_events([(kinds[i], arg_a[i], arg_b[i]) for i in range(starts[n], starts[n + 1])])
+            for n in range(len(gaps))
+        )
+        self.holds = self._net_holds()
+
+    def _net_holds(self):
+        holds = []
+        pressed = False
+        for n in range(len(self.gaps)):
+            last = {}
+            for i in range(self.starts[n], self.starts[n + 1]):
+                kind = self.kinds[i]
+                release = INPUT_RELEASE_KINDS.get(kind)
+                if release is not None:
+                    last[(release, self.arg_a[i])] = kind
+            pressed = pressed or any(kind != release for (release, _), kind in last.items())
+            holds.append(tuple((kind, code, 0) for (_, code), kind in last.items()))
+        return tuple(holds) if pressed else None
+
+    @property
+    def event_count(self):
+        return len(self.kinds)
+
+    @property
+    def batch_count(self):
+        return len(self.gaps)
+
+    @property
+    def min_gap(self):
+        return min((g for g in self.gaps if g > 0), default=0.0)
+
+    def send(self, index):
+        return self.backend.send_prepared(self.prepared[index])
+
+
+class SequenceCursor:
+    __slots__ = ("timeline", "index", "held")
+
+    def __init__(self, timeline):
+        self.timeline = timeline
+        self.index = 0
+        self.held = HeldInputs(timeline.backend)
+
+    def __call__(self, now):
+        return self.timeline.gaps[self.index]
+
+    def emit(self, count=1):
+        i = self.index
+        self.index = (i + 1) % self.timeline.batch_count
+        ok = self.timeline.send(i)
+        if self.timeline.holds is not None:
+            self.held.track(self.timeline.holds[i])
+        return ok
+
+    def release(self):
+        return self.held.release()
+
+    def close(self):
+        self.held.release()
+
+
+def _sequence_key(token):
+    text = token.strip().lower()
+    if load_keyboard() is not None:
+        try:
+            return int(keyboard.key_to_scan_codes(text)[0])
+        except Exception:
+            pass
+    if text.startswith("0x"):
+        try:
+            return int(text, 16)
+        except ValueError:
+            pass
+    raise ValueError(f"Unknown key: {token}")
+
+
+def _sequence_button(args):
+    name = args[0].lower() if args else "left"
+    button = MOUSE_BUTTON_CODES.get(name)
+    if button is None:
+        raise ValueError(f"Invalid mouse button: {name}")
+    return button, args[1:]
+
+
+def _sequence_count(args, default=1):
+    if not args:
+        return default
+    count = int(args[0])
+    if count < 1:
+        raise ValueError("Counts must be >= 1")
+    return count
+
+
+def _parse_sequence(tokens, pos, depth):
+    nodes = []
+    while pos < len(tokens):
+        token = tokens[pos].strip()
+        pos += 1
+        if not token or token in (";", "\n") or token.startswith("#"):
+            continue
+        if token == "}":
+            if depth == 0:
+                raise ValueError("Unexpected }")
+            return nodes, pos
+        if token == "{":
+            raise ValueError("Unexpected {")
+
+        words = token.split()
+        op, args = words[0].lower(), words[1:]
+        if op == "loop":
+            count = _sequence_count(args)
+            while pos < len(tokens) and tokens[pos].strip() in ("", "\n"):
+                pos += 1
+            if pos >= len(tokens) or tokens[pos] != "{":
+                raise ValueError("loop needs a { block }")
+            body, pos = _parse_sequence(tokens, pos + 1, depth + 1)
+            nodes.append(("loop", count, body))
+        elif op == "wait":
+            if len(args) != 1:
+                raise ValueError("wait takes milliseconds")
+            ms = float(args[0])
+            if not math.isfinite(ms) or ms < 0:
+                raise ValueError("wait must be >= 0 ms")
+            nodes.append(("wait", ms / 1000.0))
+        elif op == "click":
+            button, rest = _sequence_button(args)
+            nodes.append(("loop", _sequence_count(rest), [(EVENT_MOUSE_DOWN, button, 0), (EVENT_MOUSE_UP, button, 0)]))
+        elif op in ("mdown", "mup"):
+            button, _ = _sequence_button(args)
+            nodes.append((EVENT_MOUSE_DOWN if op == "mdown" else EVENT_MOUSE_UP, button, 0))
+        elif op == "tap":
+            if not args:
+                raise ValueError("tap needs a key")
+            scan = _sequence_key(args[0])
+            nodes.append(("loop", _sequence_count(args[1:]), [(EVENT_KEY_DOWN, scan, 0), (EVENT_KEY_UP, scan, 0)]))
+        elif op in ("down", "up"):
+            if len(args) != 1:
+                raise ValueError(f"{op} needs a key")
+            nodes.append((EVENT_KEY_DOWN if op == "down" else EVENT_KEY_UP, _sequence_key(args[0]), 0))
+        elif op == "move":
+            if len(args) != 2:
+                raise ValueError("move needs x y")
+            nodes.append((EVENT_MOVE, int(args[0]), int(args[1])))
+        else:
+            raise ValueError(f"Unknown command: {op}")
+    if depth:
+        raise ValueError("Missing }")
+    return nodes, pos
+
+
+def compile_sequence(script, backend):
+    try:
+        nodes, _ = _parse_sequence(SEQUENCE_TOKEN_RE.findall(str(script or "")), 0, 0)
+
+        kinds = array("B")
+        arg_a = array("i")
+        arg_b = array("i")
+        starts = array("I")
+        gaps = array("d")
+        pending = [0.0]
+        steps = [0]
+
+        def tick():
+            steps[0] += 1
+            if steps[0] > SEQUENCE_MAX_EVENTS:
+                raise ValueError(f"expands past {SEQUENCE_MAX_EVENTS} steps")
+
+        def walk(items):
+            for node in items:
+                tick()
+                if node[0] == "wait":
+                    pending[0] += node[1]
+                elif node[0] == "loop":
+                    for _ in range(node[1]):
+                        tick()
+                        walk(node[2])
+                else:
+                    if not starts or pending[0] > 0:
+                        if starts:
+                            gaps.append(pending[0])
+                        elif pending[0] > 0:
+                            starts.append(0)
+                            gaps.append(pending[0])
+                        starts.append(len(kinds))
+                        pending[0] = 0.0
+                    kinds.append(node[0])
+                    arg_a.append(node[1])
+                    arg_b.append(node[2])
+
+        walk(nodes)
+    except (ValueError, OverflowError, RecursionError) as e:
+        return False, f"Sequence: {e}"
+
+    if not kinds:
+        return False, "Sequence has no input events"
+    gaps.append(pending[0])
+    starts.append(len(kinds))
+    if sum(gaps) <= 0:
+        return False, "Sequence needs at least one wait"
+    return True, SequenceTimeline(kinds, arg_a, arg_b, starts, gaps, backend)
+
+
+class RuntimePlan:
+    __slots__ = (
+        "ok",
+        "error",
+        "cps_mode",
+        "static_cps",
+        "static_variance",
+        "variance_mode",
+        "interval_seconds",
+        "period_hint",
+        "new_period_source",
+        "output_mode",
+        "mouse_button",
+        "output_key",
+        "output",
+        "emit",
+        "describe",
+        "lock_cursor",
+        "burst",
+        "trace_code",
+        "toggle_mode",
+        "start_bind",
+        "stop_bind",
+        "name",
+        "channels",
+    )
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            object.__setattr__(self, name, fields.get(name))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("RuntimePlan is immutable")
+
+    @classmethod
+    def invalid(cls, error):
+        return cls(ok=False, error=str(error))
+
+    def with_name(self, name):
+        fields = {slot: getattr(self, slot) for slot in self.__slots__}
+        fields["name"] = name
+        return RuntimePlan(**fields)
+
+
+def build_runtime_plan(cfg, backend):
+    for key in ("start_bind", "stop_bind", "output_key", "profile_bind", "record_bind"):
+        bind = cfg.get(key)
+        if bind is None:
+            continue
+        if not isinstance(bind, (dict, types.MappingProxyType)) or (bind.get("scan_code") is not None and bind_scan(bind) is None):
+            return RuntimePlan.invalid(f"{key.replace('_', ' ').capitalize()} is malformed")
+
+    start_bind = cfg.get("start_bind") or {}
+    stop_bind = cfg.get("stop_bind") or {}
+    output_key = cfg.get("output_key") or {}
+    output_mode = cfg.get("output_mode")
+
+    if start_bind.get("scan_code") is None:
+        return RuntimePlan.invalid("Start bind is required")
+
+    if stop_bind.get("scan_code") is not None and bind_same(start_bind, stop_bind):
+        return RuntimePlan.invalid("Start bind and stop bind cannot be the same")
+
+    if cfg.get("toggle_mode") == "separate_toggle" and stop_bind.get("scan_code") is None:
+        return RuntimePlan.invalid("Separate toggle requires a stop bind")
+
+    profile_bind = cfg.get("profile_bind") or {}
+    if profile_bind.get("scan_code") is not None:
+        if bind_same(profile_bind, start_bind) or bind_same(profile_bind, stop_bind):
+            return RuntimePlan.invalid("Profile bind cannot match start or stop bind")
+        if output_mode == "keyboard" and bind_same(profile_bind, output_key):
+            return RuntimePlan.invalid("Profile bind cannot match output key")
+
+    record_bind = cfg.get("record_bind") or {}
+    if record_bind.get("scan_code") is not None:
+        if bind_same(record_bind, start_bind) or bind_same(record_bind, stop_bind) or bind_same(record_bind, profile_bind):
+            return RuntimePlan.invalid("Record bind cannot match start, stop or profile bind")
+        if output_mode == "keyboard" and bind_same(record_bind, output_key):
+            return RuntimePlan.invalid("Record bind cannot match output key")
+
+    if output_mode == "keyboard":
+        if output_key.get("scan_code") is None:
+            return RuntimePlan.invalid("Output key is required in keyboard mode")
+        if bind_same(start_bind, output_key):
+            return RuntimePlan.invalid("Start bind cannot match output key")
+        if stop_bind.get("scan_code") is not None and bind_same(stop_bind, output_key):
+            return RuntimePlan.invalid("Stop bind cannot match output key")
+
+    if cfg.get("cps_mode") == "static":
+        ok, static_cps = parse_float(cfg.get("static_cps", ""), "Static CPS", 0.001)
+        if not ok:
+            return RuntimePlan.invalid(static_cps)
+        ok, variance = parse_float(cfg.get("static_variance", ""), "Variance", 0.0)
+        if not ok:
+            return RuntimePlan.invalid(variance)
+        variance_mode = cfg.get("variance_mode") or "uniform"
+        if variance_mode not in JITTER_DISTRIBUTIONS:
+            return RuntimePlan.invalid(f"Unknown variance mode: {variance_mode}")
+        cps_mode = "static"
+        interval_seconds = None
+        period_hint = 1.0 / static_cps
+        if variance > 0:
+            new_period_source = functools.partial(JitterPeriodSource, static_cps, variance, variance_mode)
+        else:
+            new_period_source = functools.partial(FixedPeriodSource, 1.0 / static_cps)
+    else:
+        ok, h = parse_int(cfg.get("interval_hours", ""), "Hours", 0)
+        if not ok:
+            return RuntimePlan.invalid(h)
+        ok, m = parse_int(cfg.get("interval_minutes", ""), "Minutes", 0)
+        if not ok:
+            return RuntimePlan.invalid(m)
+        ok, s = parse_int(cfg.get("interval_seconds", ""), "Seconds", 0)
+        if not ok:
+            return RuntimePlan.invalid(s)
+        ok, ms = parse_int(cfg.get("interval_milliseconds", ""), "Milliseconds", 0)
+        if not ok:
+            return RuntimePlan.invalid(ms)
+
+        interval_seconds = (h * 3600) + (m * 60) + s + (ms / 1000.0)
+        if interval_seconds <= 0:
+            return RuntimePlan.invalid("Interval must be greater than 0")
+        cps_mode = "interval"
+        static_cps = None
+        variance = None
+        variance_mode = None
+        period_hint = interval_seconds
+        new_period_source = functools.partial(FixedPeriodSource, interval_seconds)
+
+    if output_mode == "sequence":
+        ok, timeline = compile_sequence(cfg.get("sequence_script", ""), backend)
+        if not ok:
+            return RuntimePlan.invalid(timeline)
+        output = timeline
+        emit = None
+        period_hint = timeline.min_gap
+        new_period_source = functools.partial(SequenceCursor, timeline)
+        describe = f"sequence={timeline.event_count} events/{timeline.batch_count} batches"
+        trace_code = 0
+    elif output_mode == "playback":
+        path = str(cfg.get("playback_file") or "").strip()
+        try:
+            RecordingReader.read_header(path)
+        except (OSError, ValueError) as e:
+            return RuntimePlan.invalid(f"Playback: {e}")
+        output = path
+        emit = None
+        period_hint = PLAYBACK_BATCH_WINDOW_US / 1e6
+        new_period_source = functools.partial(PlaybackCursor, path, backend)
+        describe = f"playback={Path(path).name}"
+        trace_code = 0
+    elif output_mode == "keyboard":
+        scan = int(output_key["scan_code"])
+        output = backend.output_buffer("keyboard", scan)
+        emit = functools.partial(backend.send_output, output)
+        describe = f"key=0x{scan:X}"
+        trace_code = scan
+    else:
+        output_mode = "mouse"
+        output = backend.output_buffer("mouse", cfg.get("mouse_button"))
+        emit = functools.partial(backend.send_output, output) if output is not None else None
+        describe = f"mouse={cfg.get('mouse_button')}"
+        trace_code = MOUSE_BUTTON_CODES.get(cfg.get("mouse_button"), 0)
+    if output is None:
+        return RuntimePlan.invalid(f"Invalid mouse button: {cfg.get('mouse_button')}")
+
+    channel_cfgs = cfg.get("channels") or ()
+    if not isinstance(channel_cfgs, (list, tuple)):
+        return RuntimePlan.invalid("Channels must be a list")
+    channels = []
+    used_scans = {int(b["scan_code"]) for b in (start_bind, stop_bind, profile_bind, record_bind) if b.get("scan_code") is not None}
+    for index, channel_cfg in enumerate(channel_cfgs, 1):
+        channel_cfg = _thaw(channel_cfg)
+        if not isinstance(channel_cfg, dict):
+            return RuntimePlan.invalid(f"Channel {index} must be an object")
+        name = str(channel_cfg.get("name") or f"Channel {index}")
+        channel_cfg = merge_config(default_config(), {k: v for k, v in channel_cfg.items() if k != "channels"})
+        channel = build_runtime_plan(channel_cfg, backend)
+        if not channel.ok:
+            return RuntimePlan.invalid(f"{name}: {channel.error}")
+        if channel.toggle_mode not in ("press", "toggle"):
+            return RuntimePlan.invalid(f"{name}: toggle mode must be press or toggle")
+        scan = int(channel.start_bind["scan_code"])
+        if scan in used_scans:
+            return RuntimePlan.invalid(f"{name}: start bind is already in use")
+        used_scans.add(scan)
+        channels.append(channel.with_name(name))
+
+    return RuntimePlan(
+        ok=True,
+        error="",
+        cps_mode=cps_mode,
+        static_cps=static_cps,
+        static_variance=variance,
+        variance_mode=variance_mode,
+        interval_seconds=interval_seconds,
+        period_hint=period_hint,
+        new_period_source=new_period_source,
+        output_mode=output_mode,
+        mouse_button=cfg.get("mouse_button"),
+        output_key=output_key,
+        output=output,
+        emit=emit,
+        describe=describe,
+        lock_cursor=output_mode == "mouse" and bool(cfg.get("lock_cursor", False)),
+        burst=output_mode not in ("sequence", "playback"),
+        trace_code=trace_code,
+        toggle_mode=cfg.get("toggle_mode"),
+        start_bind=start_bind,
+        stop_bind=stop_bind,
+        name=cfg.get("profile_name") or "main",
+        channels=tuple(channels),
+    )
 
 
 class ClickerWorker:
-    def __init__(self, config_getter, ui_queue_ref, block_click_check=None):
+    def __init__(self, config_getter, ui_queue_ref, block_click_check=None, backend=None, wait_strategy=None):
         self.config_getter = config_getter
         self.ui_queue = ui_queue_ref
         self.block_click_check = block_click_check
+        self.backend = backend if backend is not None else create_input_backend()
+        self.scheduler = create_scheduler(wait_strategy)
+        self._timer_resolution_held = False
+        self.latency = LatencyTracker()
 
         self.shutdown_event = threading.Event()
         self.active_event = threading.Event()
-        self.nudge_event = threading.Event()
+        self.wake_event = threading.Event()
+        self.active_channels = frozenset()
+        self.channels_dirty = threading.Event()
 
         self.runtime_dirty = threading.Event()
         self.runtime_dirty.set()
         self.runtime_cache = None
 
-        self._current_cps = None
-        self._next_cps_update_t = 0.0
+        self._channel_state = {}
+        self._heap = []
+
+        self._log_sends = logger.isEnabledFor(logging.DEBUG)
+        self._sent_inputs = 0
+        self._sent_calls = 0
+        self._summary_t = time.perf_counter()
 
         self._blocked_last = None
-        self._variance_tick_s = 0.25
         self._cursor_lock_anchor = None
         self._cursor_lock_interval_s = 0.05
         self._cursor_lock_next_t = 0.0
@@ -505,47 +2003,61 @@ class ClickerWorker:
         self.active_event.clear()
         self._cursor_lock_anchor = None
         self._cursor_lock_next_t = 0.0
-        self.nudge_event.set()
+        self.wake_event.set()
         self.thread.join(timeout=2)
-        logger.debug("ClickerWorker closed")
+        self._set_timer_resolution(False)
+        self.scheduler.close()
+        logger.debug("ClickerWorker closed | scheduler=%s", self.scheduler.stats())
+        logger.info("Activation latency | %s", self.latency.format_summary())
 
     def nudge(self):
         self.runtime_dirty.set()
-        self.nudge_event.set()
+        self.wake_event.set()
 
-    def set_active(self, active, reason="manual"):
+    def set_active(self, active, reason="manual", hook_ns=None, channel=None):
+        current = self.active_channels
         if active:
+            index = 0 if channel is None else int(channel)
+            if not current:
+                self.latency.begin(hook_ns)
+                self._blocked_last = None
+            self.active_channels = current | {index}
+            self.channels_dirty.set()
+            if trace.enabled:
+                trace.record(TRACE_START, channel=index)
             self.active_event.set()
             self.ui_queue.put(("status", f"Running ({reason})", "running"))
-            logger.debug("Clicker [green]started[/green]\t| reason=%s", reason.replace(" ", "_"))
-            self._current_cps = None
-            self._next_cps_update_t = 0.0
-            self._blocked_last = None
-            self._cursor_lock_anchor = WinInput.get_cursor_pos()
-            self._cursor_lock_next_t = time.perf_counter() + self._cursor_lock_interval_s
+            logger.debug("Clicker [green]started[/green]\t| reason=%s | channel=%s", reason.replace(" ", "_"), index)
+            if index == 0:
+                self._cursor_lock_anchor = self.backend.get_cursor_pos()
+                self._cursor_lock_next_t = time.perf_counter() + self._cursor_lock_interval_s
         else:
-            self.active_event.clear()
-            self.ui_queue.put(("status", "Stopped", "stopped"))
-            logger.debug("Clicker [red]stopped[/red]\t| reason=%s", reason.replace(" ", "_") )
-            self._current_cps = None
-            self._next_cps_update_t = 0.0
-            self._blocked_last = None
-            self._cursor_lock_anchor = None
-            self._cursor_lock_next_t = 0.0
-        self.nudge_event.set()
-
-    def toggle_active(self):
-        if self.active_event.is_set():
-            self.set_active(False, "toggle bind")
+            remaining = frozenset() if channel is None else current - {int(channel)}
+            self.active_channels = remaining
+            self.channels_dirty.set()
+            if trace.enabled:
+                trace.record(TRACE_STOP, channel=0xFF if channel is None else int(channel))
+            if 0 not in remaining:
+                self._cursor_lock_anchor = None
+                self._cursor_lock_next_t = 0.0
+            if remaining:
+                self.ui_queue.put(("status", "Running", "running"))
+            else:
+                self.active_event.clear()
+                self.latency.cancel()
+                self.ui_queue.put(("status", "Stopped", "stopped"))
+                self._blocked_last = None
+            logger.debug("Clicker [red]stopped[/red]\t| reason=%s | channel=%s", reason.replace(" ", "_"), "all" if channel is None else channel)
+        self.wake_event.set()
+
+    def toggle_active(self, hook_ns=None, channel=0):
+        if channel in self.active_channels:
+            self.set_active(False, "toggle bind", channel=channel)
         else:
-            self.set_active(True, "toggle bind")
+            self.set_active(True, "toggle bind", hook_ns=hook_ns, channel=channel)
 
     def _should_lock_cursor(self, runtime):
-        return bool(
-            runtime.get("output_mode") == "mouse"
-            and runtime.get("lock_cursor")
-            and self._cursor_lock_anchor is not None
-        )
+        return runtime.lock_cursor and self._cursor_lock_anchor is not None
 
     def _lock_cursor_if_due(self, runtime, now=None):
         if not self._should_lock_cursor(runtime):
@@ -558,7 +2070,7 @@ class ClickerWorker:
             return
 
         x, y = self._cursor_lock_anchor
-        WinInput.set_cursor_pos(x, y)
+        self.backend.set_cursor_pos(x, y)
         self._cursor_lock_next_t = now + self._cursor_lock_interval_s
 
     def _sleep_interruptible(self, seconds_value, runtime=None):
@@ -568,184 +2080,1049 @@ class ClickerWorker:
 
         target = time.perf_counter() + delay
 
-        while not self.shutdown_event.is_set():
-            if not self.active_event.is_set():
-                return
-
+        while not self._wait_interrupted():
             now = time.perf_counter()
             if runtime is not None:
                 self._lock_cursor_if_due(runtime, now)
 
-            remaining = target - now
-            if remaining <= 0:
+            if now >= target:
                 return
 
-            sleep_window = remaining
+            deadline = target
             if runtime is not None and self._should_lock_cursor(runtime):
-                until_lock = self._cursor_lock_next_t - now
-                if until_lock <= 0:
+                if self._cursor_lock_next_t <= now:
                     continue
-                sleep_window = min(sleep_window, until_lock)
+                deadline = min(deadline, self._cursor_lock_next_t)
+
+            self.scheduler.wait_until(deadline, self._wait_interrupted, self.wake_event)
 
-            if self.nudge_event.is_set():
-                self.nudge_event.clear()
+    def _set_timer_resolution(self, wanted):
+        wanted = bool(wanted and self.scheduler.needs_timer_resolution)
+        if wanted == self._timer_resolution_held:
+            return
+        if wanted:
+            WinTimer.begin(1)
+        else:
+            WinTimer.end(1)
+        self._timer_resolution_held = wanted
+        self.scheduler.use_timer_resolution(wanted)
+
+    def _wait_interrupted(self):
+        return (
+            self.shutdown_event.is_set()
+            or not self.active_event.is_set()
+            or self.runtime_dirty.is_set()
+            or self.channels_dirty.is_set()
+        )
 
-            if sleep_window > 0.003:
-                time.sleep(sleep_window - 0.0015)
+    def _stop_all(self):
+        self.active_channels = frozenset()
+        self.active_event.clear()
+        self.runtime_cache = None
+        self._drop_channels()
+        self._blocked_last = None
+        self._cursor_lock_anchor = None
+        self._cursor_lock_next_t = 0.0
+
+    def _log_send_summary(self, now):
+        if self._sent_calls:
+            logger.debug(
+                "[i]Inputs sent [/i]| %s in last %.2fs | sends=%s | channels=%s",
+                self._sent_inputs,
+                now - self._summary_t,
+                self._sent_calls,
+                len(self._channel_state),
+            )
+        self._sent_inputs = 0
+        self._sent_calls = 0
+        self._summary_t = now
+
+    def _close_entry(self, index, entry):
+        close = getattr(entry[3], "close", None)
+        if close is None:
+            return
+        try:
+            close()
+        except Exception:
+            logger.exception("Channel %s failed to close", index)
+
+    def _drop_channels(self):
+        for index, entry in self._channel_state.items():
+            self._close_entry(index, entry)
+        self._channel_state = {}
+        self._heap = []
+
+    def _suspend_channels(self):
+        for index, entry in self._channel_state.items():
+            release = getattr(entry[3], "release", None)
+            if release is not None and entry[1] is not None:
+                try:
+                    release()
+                except Exception:
+                    logger.exception("Channel %s failed to release input", index)
+            entry[1] = None
+        self._heap = []
+
+    def _sync_channels(self, runtime):
+        self.channels_dirty.clear()
+        active = self.active_channels
+        plans = (runtime,) + runtime.channels
+        state = {}
+        for index, entry in self._channel_state.items():
+            if index in active and index < len(plans) and entry[4] is plans[index]:
+                state[index] = entry
+            else:
+                self._close_entry(index, entry)
+        now = time.perf_counter()
+        for index, entry in state.items():
+            if entry[1] is None:
+                entry[0] = entry[1] = now
+        for index in active:
+            if index not in state and index < len(plans):
+                try:
+                    state[index] = self._channel_entry(plans[index], now, now)
+                except Exception as e:
+                    logger.exception("Channel %s failed to start", index)
+                    self.ui_queue.put(("status", f"Start failed: {e}", "error"))
+        self._channel_state = state
+        self._heap = [(entry[0], index) for index, entry in state.items()]
+        heapq.heapify(self._heap)
+
+    def _channel_entry(self, plan, next_t, now):
+        source = plan.new_period_source()
+        period = source(now)
+        wake_t = next_t + (BURST_TICK_S - period) if plan.burst and period < BURST_PERIOD_THRESHOLD_S else next_t
+        emit = plan.emit if plan.emit is not None else source.emit
+        return [wake_t, next_t, period, source, plan, emit]
+
+    def _loop(self):
+        logger.debug("Worker loop entered")
+        self.scheduler.calibrate()
+        if WinTimer.winmm is not None:
+            self._set_timer_resolution(True)
+            self._set_timer_resolution(False)
+
+        while not self.shutdown_event.is_set():
+            if not self.active_event.is_set():
+                if self._log_sends:
+                    self._log_send_summary(time.perf_counter())
+                self._set_timer_resolution(False)
+                self._drop_channels()
+                self._blocked_last = None
+                self._cursor_lock_next_t = 0.0
+                self.wake_event.wait()
+                self.wake_event.clear()
                 continue
 
-            spin_target = now + max(0.0, sleep_window)
-            while not self.shutdown_event.is_set():
-                if not self.active_event.is_set():
-                    return
-                if self.nudge_event.is_set():
-                    self.nudge_event.clear()
-                spin_now = time.perf_counter()
-                if runtime is not None:
-                    self._lock_cursor_if_due(runtime, spin_now)
-                if spin_now >= target:
+            self.latency.mark(2)
+
+            if self.runtime_cache is None or self.runtime_dirty.is_set():
+                self.runtime_dirty.clear()
+                try:
+                    runtime = self.config_getter()
+                except Exception as e:
+                    logger.exception("Failed to build runtime config")
+                    runtime = RuntimePlan.invalid(str(e))
+                if not runtime.ok:
+                    logger.warning("Runtime config invalid: %s", runtime.error)
+                    self.ui_queue.put(("status", f"Config error: {runtime.error}", "error"))
+                    self._stop_all()
+                    continue
+                period_hint = min(plan.period_hint for plan in (runtime,) + runtime.channels)
+                self._set_timer_resolution(period_hint < TIMER_RESOLUTION_MAX_PERIOD_S)
+                self.runtime_cache = runtime
+                self._log_sends = logger.isEnabledFor(logging.DEBUG)
+                self._blocked_last = None
+                self._cursor_lock_next_t = 0.0
+                self._sync_channels(runtime)
+            else:
+                runtime = self.runtime_cache
+                if self.channels_dirty.is_set():
+                    self._sync_channels(runtime)
+            self.latency.mark(3)
+
+            self._lock_cursor_if_due(runtime)
+
+            blocked = False
+            if self.block_click_check is not None and self.block_click_check():
+                blocked = True
+
+            if blocked:
+                if self._blocked_last is not True:
+                    self.ui_queue.put(("status", "Running (blocked: cursor in app)", "running"))
+                    self._blocked_last = True
+                    if trace.enabled:
+                        trace.record(TRACE_BLOCKED)
+                self._suspend_channels()
+                self._sleep_interruptible(0.02, runtime)
+                continue
+            else:
+                if self._blocked_last is True:
+                    self.ui_queue.put(("status", "Running", "running"))
+                    if trace.enabled:
+                        trace.record(TRACE_UNBLOCKED)
+                self._blocked_last = False
+
+            if not self._heap:
+                self._sync_channels(runtime)
+                if not self._heap:
+                    self.wake_event.wait()
+                    self.wake_event.clear()
+                    continue
+
+            now = time.perf_counter()
+            wake_t, index = self._heap[0]
+            if now < wake_t:
+                self._sleep_interruptible(wake_t - now, runtime)
+                continue
+
+            entry = self._channel_state[index]
+            _, next_t, period, source, plan, emit = entry
+
+            count = 1
+            if plan.burst and period < BURST_PERIOD_THRESHOLD_S:
+                count = min(BURST_MAX_CLICKS, int((now - next_t) / period) + 1)
+
+            if not emit(count):
+                logger.error("Input send failed, stopping clicker")
+                self.ui_queue.put(("status", "Input send failed", "error"))
+                self._stop_all()
+                continue
+
+            self.latency.finish()
+            if trace.enabled:
+                trace.record(TRACE_EMIT, plan.trace_code, int(next_t * 1e9), int(now * 1e9), count, index)
+
+            next_t += period * count
+
+            after = time.perf_counter()
+            if self._log_sends:
+                self._sent_inputs += count
+                self._sent_calls += 1
+                if after - self._summary_t >= LOG_SUMMARY_INTERVAL_S:
+                    self._log_send_summary(after)
+            if after > next_t + (period * 4):
+                next_t = after
+
+            period = source(after)
+            entry[0] = next_t + (BURST_TICK_S - period) if plan.burst and period < BURST_PERIOD_THRESHOLD_S else next_t
+            entry[1] = next_t
+            entry[2] = period
+            heapq.heapreplace(self._heap, (entry[0], index))
+
+        self._drop_channels()
+        logger.debug("Worker loop exited")
+
+
+HOOK_RING_CAPACITY = 256
+HOOK_TIME_BUCKETS = 32
+
+HOTKEY_CONFIG_KEYS = frozenset(("start_bind", "stop_bind", "toggle_mode", "channels", "record_bind"))
+HOTKEY_START = 1
+HOTKEY_STOP = 2
+HOTKEY_TOGGLE = 3
+HOTKEY_HOLD_START = 4
+HOTKEY_HOLD_STOP = 5
+HOTKEY_PROFILE = 6
+HOTKEY_CHANNEL_ON = 7
+HOTKEY_CHANNEL_OFF = 8
+HOTKEY_CHANNEL_TOGGLE = 9
+HOTKEY_RECORD = 10
+
+
+def build_hotkey_table(cfg, profile_binds=None):
+    start_scan = bind_scan(cfg.get("start_bind"))
+    stop_scan = bind_scan(cfg.get("stop_bind"))
+    toggle_mode = cfg.get("toggle_mode", "press")
+    channels = cfg.get("channels") or ()
+    if not isinstance(channels, (list, tuple)):
+        channels = ()
+
+    table = {}
+    for name, scan in (profile_binds or {}).items():
+        if isinstance(scan, int) and not isinstance(scan, bool):
+            table[scan] = (HOTKEY_PROFILE, None, True, name)
+
+    for index, channel in enumerate(channels, 1):
+        if not isinstance(channel, (dict, types.MappingProxyType)):
+            continue
+        scan = bind_scan(channel.get("start_bind"))
+        if scan is None:
+            continue
+        if channel.get("toggle_mode", "press") == "press":
+            table[int(scan)] = (HOTKEY_CHANNEL_ON, HOTKEY_CHANNEL_OFF, True, index)
+        else:
+            table[int(scan)] = (HOTKEY_CHANNEL_TOGGLE, None, True, index)
+
+    record_scan = bind_scan(cfg.get("record_bind"))
+    if record_scan is not None:
+        table[int(record_scan)] = (HOTKEY_RECORD, None, False, None)
+
+    if start_scan is not None:
+        if toggle_mode == "press":
+            table[int(start_scan)] = (HOTKEY_HOLD_START, HOTKEY_HOLD_STOP, True, None)
+        elif toggle_mode == "toggle":
+            table[int(start_scan)] = (HOTKEY_TOGGLE, None, True, None)
+        elif toggle_mode == "separate_toggle":
+            table[int(start_scan)] = (HOTKEY_START, None, True, None)
+
+    if stop_scan is not None:
+        shared = table.get(int(stop_scan))
+        up_action = shared[1] if shared and shared[3] is None else None
+        table[int(stop_scan)] = (HOTKEY_STOP, up_action, False, None)
+
+    return table
+
+
+class HookEventRing:
+    def __init__(self, capacity):
+        capacity = 1 << max(1, int(capacity) - 1).bit_length()
+        self._slots = [None] * capacity
+        self._mask = capacity - 1
+        self._head = 0
+        self._tail = 0
+        self.dropped = 0
+        self.max_depth = 0
+
+    def __len__(self):
+        return self._tail - self._head
+
+    def push(self, item):
+        tail = self._tail
+        depth = tail - self._head
+        if depth > self._mask:
+            self.dropped += 1
+            return False
+        self._slots[tail & self._mask] = item
+        self._tail = tail + 1
+        if depth + 1 > self.max_depth:
+            self.max_depth = depth + 1
+        return True
+
+    def pop(self):
+        head = self._head
+        if head == self._tail:
+            return None
+        idx = head & self._mask
+        item = self._slots[idx]
+        self._slots[idx] = None
+        self._head = head + 1
+        return item
+
+
+class HotkeyDispatcher:
+    def __init__(self, worker, start_block_reason=None, profile_switcher=None, record_toggler=None):
+        self.worker = worker
+        self.start_block_reason = start_block_reason
+        self.profile_switcher = profile_switcher
+        self.record_toggler = record_toggler
+        self.table = {}
+        self.pressed = set()
+
+        self.ring = HookEventRing(HOOK_RING_CAPACITY)
+        self.hook_events = 0
+        self.hook_time_hist = [0] * HOOK_TIME_BUCKETS
+        self.hook_time_max_ns = 0
+        self._wake = threading.Event()
+        self._sleeping = False
+        self._closed = False
+        self.thread = threading.Thread(target=self._loop, name="hotkey-dispatch", daemon=True)
+        self.thread.start()
+
+    def rebuild(self, cfg, profile_binds=None):
+        self.table = build_hotkey_table(cfg, profile_binds)
+        self.pressed = set()
+        logger.debug("Hotkey table rebuilt | %s", {f"0x{k:X}": v for k, v in self.table.items()})
+
+    def hook(self, event):
+        hook_ns = time.perf_counter_ns()
+        scan_code = event.scan_code
+        if scan_code not in self.table:
+            return
+
+        is_down = event.event_type == "down"
+        self.ring.push((scan_code, is_down, hook_ns))
+        if self._sleeping:
+            self._wake.set()
+        if trace.enabled:
+            trace.record(TRACE_HOOK_DOWN if is_down else TRACE_HOOK_UP, scan_code, 0, hook_ns)
+
+        elapsed = time.perf_counter_ns() - hook_ns
+        self.hook_events += 1
+        self.hook_time_hist[min(HOOK_TIME_BUCKETS - 1, elapsed.bit_length())] += 1
+        if elapsed > self.hook_time_max_ns:
+            self.hook_time_max_ns = elapsed
+
+    def close(self):
+        self._closed = True
+        self._wake.set()
+        self.thread.join(timeout=2)
+        logger.debug("Hotkey dispatcher closed | %s", self.stats())
+
+    def stats(self):
+        hist = list(self.hook_time_hist)
+        total = sum(hist)
+        p99_ns = 0
+        seen = 0
+        for i, n in enumerate(hist):
+            seen += n
+            if n and seen >= 0.99 * total:
+                p99_ns = (1 << i) - 1 if i else 0
+                break
+        return {
+            "hook_events": self.hook_events,
+            "hook_time_p99_ns_le": p99_ns,
+            "hook_time_max_ns": self.hook_time_max_ns,
+            "queue_depth": len(self.ring),
+            "queue_max_depth": self.ring.max_depth,
+            "queue_dropped": self.ring.dropped,
+        }
+
+    def _loop(self):
+        while not self._closed:
+            item = self.ring.pop()
+            if item is None:
+                self._wake.clear()
+                self._sleeping = True
+                if len(self.ring) == 0 and not self._closed:
+                    self._wake.wait()
+                self._sleeping = False
+                continue
+            try:
+                self.on_event(*item)
+            except Exception:
+                logger.exception("Hotkey dispatch failed")
+
+    def on_event(self, scan_code, is_down, hook_ns):
+        entry = self.table.get(scan_code)
+        if entry is None:
+            return
+
+        if is_down:
+            if scan_code in self.pressed:
+                return
+            self.pressed.add(scan_code)
+            action = entry[0]
+        else:
+            self.pressed.discard(scan_code)
+            action = entry[1]
+
+        if action is None:
+            return
+
+        if is_down and entry[2] and self.start_block_reason is not None:
+            reason = self.start_block_reason()
+            if reason:
+                logger.debug("Hotkey ignored (%s)", reason)
+                return
+
+        self.dispatch(action, hook_ns, entry[3])
+
+    def dispatch(self, action, hook_ns=None, arg=None):
+        if action == HOTKEY_STOP:
+            self.worker.set_active(False, "stop bind")
+        elif action == HOTKEY_HOLD_START:
+            self.worker.set_active(True, "hold bind", hook_ns=hook_ns)
+        elif action == HOTKEY_HOLD_STOP:
+            self.worker.set_active(False, "hold bind", channel=0)
+        elif action == HOTKEY_TOGGLE:
+            self.worker.toggle_active(hook_ns=hook_ns)
+        elif action == HOTKEY_START:
+            self.worker.set_active(True, "stop bind", hook_ns=hook_ns)
+        elif action == HOTKEY_PROFILE and self.profile_switcher is not None:
+            self.profile_switcher(arg)
+        elif action == HOTKEY_CHANNEL_ON:
+            self.worker.set_active(True, "channel bind", hook_ns=hook_ns, channel=arg)
+        elif action == HOTKEY_CHANNEL_OFF:
+            self.worker.set_active(False, "channel bind", channel=arg)
+        elif action == HOTKEY_CHANNEL_TOGGLE:
+            self.worker.toggle_active(hook_ns=hook_ns, channel=arg)
+        elif action == HOTKEY_RECORD and self.record_toggler is not None:
+            self.record_toggler()
+
+
+class ConfigPersister:
+    def __init__(self, path, data_getter):
+        self.path = Path(path)
+        self.data_getter = data_getter
+        self.writes = 0
+        self.skipped = 0
+
+        self._cond = threading.Condition()
+        self._requested_t = None
+        self._last_write_t = 0.0
+        self._last_hash = None
+        self._closed = False
+        self._write_lock = threading.Lock()
+
+        self.thread = threading.Thread(target=self._loop, name="config-persist", daemon=True)
+        self.thread.start()
+
+    def mark_saved(self, data):
+        self._last_hash = hashlib.sha1(self._serialize(data)).hexdigest()
+
+    def request_save(self):
+        with self._cond:
+            self._requested_t = time.monotonic()
+            self._cond.notify()
+
+    def flush(self):
+        with self._cond:
+            pending = self._requested_t is not None
+            self._requested_t = None
+        if pending:
+            self._write()
+
+    def close(self):
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self.thread.join(timeout=2)
+        logger.debug("Config persister closed | writes=%s | skipped=%s", self.writes, self.skipped)
+
+    def _serialize(self, data):
+        return json.dumps(data, indent=2).encode("utf-8")
+
+    def _write(self):
+        with self._write_lock:
+            try:
+                payload = self._serialize(self.data_getter())
+                digest = hashlib.sha1(payload).hexdigest()
+                if digest == self._last_hash:
+                    self.skipped += 1
                     return
-                if spin_now >= spin_target:
-                    break
-                time.sleep(0)
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                temp_path = self.path.with_suffix(".tmp")
+                temp_path.write_bytes(payload)
+                temp_path.replace(self.path)
+                self._last_hash = digest
+                self.writes += 1
+                logger.debug("Config saved")
+            except Exception:
+                logger.exception("Failed to save config")
+            finally:
+                self._last_write_t = time.monotonic()
 
     def _loop(self):
-        logger.debug("Worker loop entered")
-        next_t = None
+        while True:
+            with self._cond:
+                while not self._closed:
+                    if self._requested_t is not None:
+                        due = max(
+                            self._requested_t + CONFIG_SAVE_DEBOUNCE_S,
+                            self._last_write_t + CONFIG_SAVE_MIN_INTERVAL_S,
+                        )
+                        remaining = due - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+                    else:
+                        self._cond.wait()
+                if self._closed:
+                    return
+                self._requested_t = None
+            self._write()
+
+
+PROFILE_NAME_RE = re.compile(r"^[A-Za-z0-9_-][A-Za-z0-9 _.-]{0,39}$")
+PROFILE_GLOBAL_KEYS = ("code_display", "elevate_on_start")
+
+
+class ProfileStore:
+    def __init__(self, directory, backend):
+        self.directory = Path(directory)
+        self.backend = backend
+        self.index_path = self.directory / "index.json"
+        self._lock = threading.Lock()
+        self._cache = {}
+        self._binds = self._read_index()
+
+    def names(self):
+        with self._lock:
+            return sorted(self._binds, key=str.lower)
+
+    def binds(self):
+        with self._lock:
+            return dict(self._binds)
+
+    def valid_name(self, name):
+        return bool(PROFILE_NAME_RE.match(str(name or "")))
+
+    def path_for(self, name):
+        if not self.valid_name(name):
+            raise ValueError(f"Invalid profile name: {name!r}")
+        return self.directory / f"{name}.json"
+
+    def load(self, name):
+        with self._lock:
+            cached = self._cache.get(name)
+        if cached is not None:
+            return cached
+
+        cfg = default_config()
+        loaded = json.loads(self.path_for(name).read_text(encoding="utf-8"))
+        if isinstance(loaded, dict):
+            merge_config(cfg, loaded)
+        cfg["profile_name"] = name
+        entry = self._compile(cfg)
+        with self._lock:
+            self._cache[name] = entry
+        logger.debug("Profile loaded | %s | ok=%s", name, entry[1].ok)
+        return entry
+
+    def save(self, name, cfg):
+        merged = merge_config(default_config(), cfg)
+        merged["profile_name"] = name
+        data = {k: v for k, v in merged.items() if k not in PROFILE_GLOBAL_KEYS}
+        with self._lock:
+            cached = self._cache.get(name)
+            known = name in self._binds
+        if known and cached is not None:
+            current = {k: v for k, v in cached[0].to_dict().items() if k not in PROFILE_GLOBAL_KEYS}
+            if current == data:
+                return cached
+
+        self._write_json(self.path_for(name), data)
+        entry = self._compile(merged)
+        with self._lock:
+            self._cache[name] = entry
+            self._binds[name] = (data.get("profile_bind") or {}).get("scan_code")
+            index = dict(self._binds)
+        self._write_json(self.index_path, index)
+        logger.info("Profile saved | %s", name)
+        return entry
+
+    def delete(self, name):
+        with self._lock:
+            self._cache.pop(name, None)
+            removed = name in self._binds
+            self._binds.pop(name, None)
+            index = dict(self._binds)
+        if not removed:
+            return False
+        try:
+            self.path_for(name).unlink(missing_ok=True)
+            self._write_json(self.index_path, index)
+        except Exception:
+            logger.exception("Failed to delete profile %s", name)
+        logger.info("Profile deleted | %s", name)
+        return True
+
+    def _compile(self, cfg):
+        snapshot = ConfigSnapshot(cfg)
+        return snapshot, build_runtime_plan(snapshot, self.backend)
+
+    def _write_json(self, path, data):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        temp_path.replace(path)
+
+    def _read_index(self):
+        binds = {}
+        try:
+            if self.index_path.exists():
+                loaded = json.loads(self.index_path.read_text(encoding="utf-8"))
+                if isinstance(loaded, dict):
+                    binds = {str(k): v for k, v in loaded.items() if self.valid_name(k)}
+            elif self.directory.is_dir():
+                for path in self.directory.glob("*.json"):
+                    if path != self.index_path and self.valid_name(path.stem):
+                        binds[path.stem] = None
+        except Exception:
+            logger.exception("Failed to read profile index")
+        logger.debug("Profile index | %s", binds)
+        return binds
+
+
+class MouseHook:
+    MESSAGES = {
+        0x0200: (EVENT_MOVE, 0),
+        0x0201: (EVENT_MOUSE_DOWN, MOUSE_BUTTON_CODES["left"]),
+        0x0202: (EVENT_MOUSE_UP, MOUSE_BUTTON_CODES["left"]),
+        0x0204: (EVENT_MOUSE_DOWN, MOUSE_BUTTON_CODES["right"]),
+        0x0205: (EVENT_MOUSE_UP, MOUSE_BUTTON_CODES["right"]),
+        0x0207: (EVENT_MOUSE_DOWN, MOUSE_BUTTON_CODES["middle"]),
+        0x0208: (EVENT_MOUSE_UP, MOUSE_BUTTON_CODES["middle"]),
+    }
+
+    def __init__(self, callback):
+        if not IS_WINDOWS:
+            raise OSError("Mouse hook requires Windows")
+        self.callback = callback
+        self.user32 = ctypes.WinDLL("user32", use_last_error=True)
+        self.kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+
+        hook_proc = ctypes.WINFUNCTYPE(wintypes.LPARAM, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM)
+        self.user32.SetWindowsHookExW.argtypes = [ctypes.c_int, hook_proc, wintypes.HINSTANCE, wintypes.DWORD]
+        self.user32.SetWindowsHookExW.restype = wintypes.HHOOK
+        self.user32.CallNextHookEx.argtypes = [wintypes.HHOOK, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM]
+        self.user32.CallNextHookEx.restype = wintypes.LPARAM
+        self.user32.UnhookWindowsHookEx.argtypes = [wintypes.HHOOK]
+        self.user32.UnhookWindowsHookEx.restype = wintypes.BOOL
+        self.user32.GetMessageW.argtypes = [ctypes.POINTER(wintypes.MSG), wintypes.HWND, wintypes.UINT, wintypes.UINT]
+        self.user32.GetMessageW.restype = wintypes.BOOL
+        self.user32.PostThreadMessageW.argtypes = [wintypes.DWORD, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM]
+        self.user32.PostThreadMessageW.restype = wintypes.BOOL
+        self.kernel32.GetModuleHandleW.argtypes = [wintypes.LPCWSTR]
+        self.kernel32.GetModuleHandleW.restype = wintypes.HMODULE
+        self._proc = hook_proc(self._handle)
+        self._hook = None
+        self._thread_id = None
+        self._ready = threading.Event()
+
+        self.thread = threading.Thread(target=self._run, name="mouse-hook", daemon=True)
+        self.thread.start()
+        self._ready.wait(timeout=2)
+        if not self._hook:
+            raise OSError(f"SetWindowsHookExW failed: {ctypes.get_last_error()}")
+        logger.debug("Mouse hook registered")
+
+    def _run(self):
+        self._thread_id = self.kernel32.GetCurrentThreadId()
+        self._hook = self.user32.SetWindowsHookExW(WH_MOUSE_LL, self._proc, self.kernel32.GetModuleHandleW(None), 0)
+        self._ready.set()
+        if not self._hook:
+            return
+        msg = wintypes.MSG()
+        while self.user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+            self.user32.TranslateMessage(ctypes.byref(msg))
+            self.user32.DispatchMessageW(ctypes.byref(msg))
+        self.user32.UnhookWindowsHookEx(self._hook)
+
+    def _handle(self, n_code, w_param, l_param):
+        if n_code == 0:
+            entry = self.MESSAGES.get(w_param)
+            if entry is not None:
+                info = ctypes.cast(l_param, ctypes.POINTER(MSLLHOOKSTRUCT)).contents
+                if not info.flags & LLMHF_INJECTED:
+                    self.callback(time.perf_counter_ns(), entry[0], entry[1], info.pt.x, info.pt.y)
+        return self.user32.CallNextHookEx(None, n_code, w_param, l_param)
+
+    def close(self):
+        if self._thread_id is not None:
+            self.user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+        self.thread.join(timeout=2)
+        logger.debug("Mouse hook removed")
+
+
+class RecordingWriter:
+    def __init__(self, path, compress=None):
+        if compress is None:
+            compress = RECORDING_COMPRESS
+        if compress and zstandard is None:
+            raise RuntimeError("zstandard is not installed")
+
+        self.path = Path(path)
+        self.compressed = bool(compress)
+        self.records = 0
+        self._last_us = None
+        self._chunk = bytearray(RECORDING_RECORD.size * RECORDING_CHUNK_RECORDS)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "wb")
+        flags = RECORDING_FLAG_ZSTD if self.compressed else 0
+        self._file.write(RECORDING_HEADER.pack(RECORDING_MAGIC, RECORDING_VERSION, flags, RECORDING_RECORD.size, time.time_ns()))
+        if self.compressed:
+            self._stream = zstandard.ZstdCompressor(level=RECORDING_ZSTD_LEVEL).stream_writer(self._file)
+        else:
+            self._stream = self._file
+
+    def write(self, items):
+        pack_into = RECORDING_RECORD.pack_into
+        size = RECORDING_RECORD.size
+        chunk = self._chunk
+        view = memoryview(chunk)
+        n = 0
+        last_us = self._last_us
+
+        for t_ns, kind, code, x, y in items:
+            us = t_ns // 1000
+            if last_us is None:
+                last_us = us
+            delta = us - last_us
+            if delta < 0:
+                delta = 0
+            else:
+                last_us = us
+            while delta > RECORDING_MAX_DELTA_US:
+                pack_into(chunk, n * size, RECORDING_MAX_DELTA_US, RECORDING_PAD, 0, 0, 0, 0)
+                delta -= RECORDING_MAX_DELTA_US
+                n += 1
+                if n == RECORDING_CHUNK_RECORDS:
+                    self._stream.write(view)
+                    self.records += n
+                    n = 0
+            pack_into(chunk, n * size, delta, kind, 0, code, x, y)
+            n += 1
+            if n == RECORDING_CHUNK_RECORDS:
+                self._stream.write(view)
+                self.records += n
+                n = 0
+
+        if n:
+            self._stream.write(view[: n * size])
+            self.records += n
+        self._last_us = last_us
+
+    def close(self):
+        if self._stream is not self._file:
+            self._stream.close()
+        self._file.close()
+
+
+class RecordingReader:
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            _, _, flags, _, self.started_ns = self._parse_header(self._file.read(RECORDING_HEADER.size))
+        except Exception:
+            self._file.close()
+            raise
+        self.compressed = bool(flags & RECORDING_FLAG_ZSTD)
+        self._mmap = None
+        if not self.compressed:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
 
-        while not self.shutdown_event.is_set():
-            if not self.active_event.wait(timeout=0.1):
-                next_t = None
-                self._blocked_last = None
-                self._cursor_lock_next_t = 0.0
-                continue
+    @staticmethod
+    def _parse_header(data):
+        if len(data) < RECORDING_HEADER.size:
+            raise ValueError("not a recording (file too short)")
+        magic, version, flags, record_size, started_ns = RECORDING_HEADER.unpack_from(data)
+        if magic != RECORDING_MAGIC:
+            raise ValueError("not a recording (bad magic)")
+        if version != RECORDING_VERSION or record_size != RECORDING_RECORD.size:
+            raise ValueError(f"unsupported recording version {version}")
+        if flags & RECORDING_FLAG_ZSTD and zstandard is None:
+            raise ValueError("recording is zstd-compressed but zstandard is not installed")
+        return magic, version, flags, record_size, started_ns
+
+    @classmethod
+    def read_header(cls, path):
+        if not path:
+            raise ValueError("no recording selected")
+        with open(path, "rb") as f:
+            return cls._parse_header(f.read(RECORDING_HEADER.size))
 
-            if self.runtime_cache is None or self.runtime_dirty.is_set():
-                self.runtime_dirty.clear()
-                runtime = self.config_getter()
-                if not runtime["ok"]:
-                    logger.warning("Runtime config invalid: %s", runtime["error"])
-                    self.ui_queue.put(("status", f"Config error: {runtime['error']}", "error"))
-                    self.active_event.clear()
-                    self.runtime_cache = None
-                    next_t = None
-                    self._current_cps = None
-                    self._next_cps_update_t = 0.0
-                    self._blocked_last = None
-                    self._cursor_lock_anchor = None
-                    self._cursor_lock_next_t = 0.0
-                    continue
-                self.runtime_cache = runtime
-                next_t = None
-                self._current_cps = None
-                self._next_cps_update_t = 0.0
-                self._blocked_last = None
-                self._cursor_lock_next_t = 0.0
-            else:
-                runtime = self.runtime_cache
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def raw_records(self):
+        size = RECORDING_RECORD.size
+        if self._mmap is not None:
+            body = len(self._mmap) - RECORDING_HEADER.size
+            view = memoryview(self._mmap)[RECORDING_HEADER.size : RECORDING_HEADER.size + body - body % size]
+            try:
+                yield from RECORDING_RECORD.iter_unpack(view)
+            finally:
+                view.release()
+            return
 
-            self._lock_cursor_if_due(runtime)
+        self._file.seek(RECORDING_HEADER.size)
+        stream = zstandard.ZstdDecompressor().stream_reader(self._file, closefd=False)
+        leftover = b""
+        while True:
+            data = stream.read(size * RECORDING_CHUNK_RECORDS)
+            if not data:
+                break
+            if leftover:
+                data = leftover + data
+            usable = len(data) - len(data) % size
+            leftover = data[usable:]
+            yield from RECORDING_RECORD.iter_unpack(memoryview(data)[:usable])
+
+    def records(self):
+        t_us = 0
+        for delta, kind, _, code, x, y in self.raw_records():
+            t_us += delta
+            if kind != RECORDING_PAD:
+                yield t_us, kind, code, x, y
+
+
+class PlaybackCursor:
+    __slots__ = ("reader", "backend", "held", "batch", "gap", "_records", "_carry")
+
+    def __init__(self, path, backend):
+        self.reader = RecordingReader(path)
+        self.backend = backend
+        self.held = HeldInputs(backend)
+        self._records = self.reader.records()
+        self._carry = next(self._records, None)
+        if self._carry is None:
+            self.reader.close()
+            raise ValueError(f"{self.reader.path.name} has no events")
+        self._load()
+
+    def _load(self):
+        first = self._carry
+        start = first[0]
+        batch = [(first[1], first[3], first[4]) if first[1] == EVENT_MOVE else (first[1], first[2], 0)]
+        for record in self._records:
+            if record[0] - start > PLAYBACK_BATCH_WINDOW_US or len(batch) >= PLAYBACK_MAX_BATCH:
+                self._carry = record
+                self.gap = (record[0] - start) / 1e6
+                break
+            kind = record[1]
+            batch.append((kind, record[3], record[4]) if kind == EVENT_MOVE else (kind, record[2], 0))
+        else:
+            self._records = self.reader.records()
+            self._carry = next(self._records)
+            self.gap = PLAYBACK_REPEAT_GAP_S
+        self.batch = batch
 
-            blocked = False
-            if self.block_click_check is not None and self.block_click_check():
-                blocked = True
+    def __call__(self, now):
+        return self.gap
 
-            if blocked:
-                if self._blocked_last is not True:
-                    self.ui_queue.put(("status", "Running (blocked: cursor in app)", "running"))
-                    self._blocked_last = True
-                self._sleep_interruptible(0.02, runtime)
-                next_t = None
-                self._current_cps = None
-                self._next_cps_update_t = 0.0
-                continue
-            else:
-                if self._blocked_last is True:
-                    self.ui_queue.put(("status", "Running", "running"))
-                self._blocked_last = False
+    def release(self):
+        return self.held.release()
 
-            now = time.perf_counter()
-            if next_t is None:
-                next_t = now
-
-            if runtime["cps_mode"] == "static":
-                base = float(runtime["static_cps"])
-                var = float(runtime["static_variance"])
-
-                if self._current_cps is None:
-                    self._current_cps = base
-                    self._next_cps_update_t = now + self._variance_tick_s
-
-                if now >= self._next_cps_update_t:
-                    if var > 0:
-                        if float(var).is_integer():
-                            delta = random.randint(-int(var), int(var))
-                            self._current_cps = max(0.001, base + delta)
-                        else:
-                            delta = random.uniform(-var, var)
-                            self._current_cps = max(0.001, base + delta)
-                    else:
-                        self._current_cps = base
+    def close(self):
+        self.held.release()
+        self._records.close()
+        self.reader.close()
+
+    def emit(self, count=1):
+        ok = self.backend.send_events(self.batch)
+        self.held.track(self.batch)
+        self._load()
+        return ok
+
+
+class InputRecorder:
+    def __init__(self, path, compress=None, ignore_scans=()):
+        self.writer = RecordingWriter(path, compress)
+        self.path = self.writer.path
+        self.ignore_scans = frozenset(int(s) for s in ignore_scans if s is not None)
+        self._pending = collections.deque()
+        self._stop = threading.Event()
+
+        self.thread = threading.Thread(target=self._loop, name="input-recorder", daemon=True)
+        self.thread.start()
 
-                    self._next_cps_update_t = now + self._variance_tick_s
+        self.mouse_hook = None
+        try:
+            self.mouse_hook = MouseHook(self.on_mouse)
+        except OSError as e:
+            logger.info("Mouse hook unavailable, recording keys only: %s", e)
+        logger.info("Recording started | %s | zstd=%s", self.path, self.writer.compressed)
+
+    def on_key(self, event):
+        scan_code = event.scan_code
+        if scan_code is None or scan_code in self.ignore_scans:
+            return
+        kind = EVENT_KEY_DOWN if event.event_type == "down" else EVENT_KEY_UP
+        self._pending.append((time.perf_counter_ns(), kind, int(scan_code), 0, 0))
 
-                    logger.debug("CPS target now: %.3f (base=%.3f var=%.3f)", float(self._current_cps), base, var)
+    def on_mouse(self, t_ns, kind, code, x, y):
+        self._pending.append((t_ns, kind, code, x, y))
 
-                period = 1.0 / max(0.001, float(self._current_cps))
-            else:
-                self._current_cps = None
-                self._next_cps_update_t = 0.0
-                period = float(runtime["interval_seconds"])
+    def close(self):
+        if self.mouse_hook is not None:
+            self.mouse_hook.close()
+        self._stop.set()
+        self.thread.join(timeout=2)
+        try:
+            self._drain()
+        finally:
+            self.writer.close()
+        logger.info("Recording saved | %s | records=%s", self.path, self.writer.records)
+        return self.writer.records
 
-            if now < next_t:
-                self._sleep_interruptible(next_t - now, runtime)
-                continue
+    def _drain(self):
+        pending = self._pending
+        popleft = pending.popleft
+        self.writer.write(popleft() for _ in range(len(pending)))
 
-            if runtime["output_mode"] == "mouse":
-                ok = WinInput.click_mouse(runtime["mouse_button"])
-            else:
-                ok = WinInput.tap_key(runtime["output_key"]["scan_code"])
+    def _loop(self):
+        while not self._stop.wait(RECORDING_FLUSH_S):
+            try:
+                self._drain()
+            except Exception:
+                logger.exception("Recording write failed")
+                return
 
-            if not ok:
-                logger.error("Input send failed, stopping clicker")
-                self.ui_queue.put(("status", "Input send failed", "error"))
-                self.active_event.clear()
-                next_t = None
-                self._current_cps = None
-                self._next_cps_update_t = 0.0
-                self._blocked_last = None
-                self._cursor_lock_anchor = None
-                self._cursor_lock_next_t = 0.0
-                continue
-            
-            else:
-                if runtime["output_mode"] == "mouse":
-                    logger.debug("[i]Input sent [/i]| mouse=%s |", runtime["mouse_button"])    
-                else:
-                    logger.debug("[i]Input sent [/i]| key=%s |", hex(runtime["output_key"]["scan_code"]))
 
-            next_t += period
+class ClickerController:
+    def __init__(self, cfg):
+        self.ui_queue = queue.Queue()
+        self.config_write_lock = threading.Lock()
+        self.config_snapshot = ConfigSnapshot(cfg)
+        self._plan_cache = (None, None)
 
-            after = time.perf_counter()
-            if after > next_t + (period * 4):
-                next_t = after
+    def _build_runtime_config(self):
+        snapshot = self.config_snapshot
+        version, plan = self._plan_cache
+        if version == snapshot.version and plan is not None:
+            return plan
+        plan = build_runtime_plan(snapshot, self.input_backend)
+        self._plan_cache = (snapshot.version, plan)
+        return plan
+
+    def _update_config(self, **changes):
+        with self.config_write_lock:
+            previous = self.config_snapshot
+            current = self.config_snapshot = previous.replace(**changes)
+        if current is previous:
+            return current
+        if trace.enabled:
+            trace.record(TRACE_CONFIG, current.version)
+        if any(current.get(key) != previous.get(key) for key in HOTKEY_CONFIG_KEYS.intersection(changes)):
+            self._rebuild_hotkeys()
+        return current
+
+    def _rebuild_hotkeys(self):
+        self.hotkeys.rebuild(self.config_snapshot, self.profiles.binds())
+
+    def _switch_profile(self, name):
+        if not self.profiles.valid_name(name):
+            return False
+        try:
+            snapshot, plan = self.profiles.load(name)
+        except Exception:
+            logger.exception("Failed to load profile %s", name)
+            self.ui_queue.put(("status", f"Profile load failed: {name}", "error"))
+            return False
 
-        logger.debug("Worker loop exited")
+        with self.config_write_lock:
+            outgoing = self.config_snapshot
+            if outgoing.get("profile_name") == name:
+                return False
+            data = snapshot.to_dict()
+            for key in PROFILE_GLOBAL_KEYS:
+                data[key] = outgoing.get(key)
+            self.config_snapshot = ConfigSnapshot(data, outgoing.version + 1)
+            self._plan_cache = (self.config_snapshot.version, plan)
+        if trace.enabled:
+            trace.record(TRACE_CONFIG, self.config_snapshot.version)
+
+        self._rebuild_hotkeys()
+        self.worker.nudge()
+        logger.info("Profile switched | %s -> %s", outgoing.get("profile_name") or "-", name)
+        self._on_profile_switched(outgoing, name)
+        return True
 
+    def _on_profile_switched(self, outgoing, name):
+        pass
 
-class AutoClickerApp:
-    def __init__(self, root):
+
+class AutoClickerApp(ClickerController):
+    def __init__(self, root, cfg=None):
+        super().__init__(load_config() if cfg is None else cfg)
         self.root = root
         self.root.title(APP_NAME)
         self.hwnd = int(self.root.winfo_id())
 
-        self.ui_queue = queue.Queue()
-        self.config_lock = threading.Lock()
-        self.hotkey_lock = threading.Lock()
         self.capture_lock = threading.Lock()
+        self.recorder_lock = threading.Lock()
+        self.recorder = None
 
-        self.config = self._load_config()
-        self.pressed_scans = set()
+        self.persister = ConfigPersister(CONFIG_PATH, self._config_data)
+        self.persister.mark_saved(self._config_data())
         self.capture_target = None
         self.capture_threads = {}
         self.current_theme_mode = None
@@ -753,20 +3130,29 @@ class AutoClickerApp:
 
         self.style = ttk.Style(self.root)
         self._apply_theme(force=True)
+        startup.mark("theme")
 
+        self.input_backend = create_input_backend()
+        self.window_guard = WindowGuard(self.hwnd, self.input_backend)
+        self.profiles = ProfileStore(PROFILES_DIR, self.input_backend)
         self.worker = ClickerWorker(
             self._build_runtime_config,
             self.ui_queue,
-            block_click_check=lambda: WinFocus.is_cursor_in_window(self.hwnd),
+            block_click_check=self.window_guard.is_cursor_in_window,
+            backend=self.input_backend,
         )
+        self.hotkeys = HotkeyDispatcher(self.worker, self._start_block_reason, self._switch_profile, self._toggle_recording)
+        self._rebuild_hotkeys()
+        startup.mark("worker")
 
         self.kb_hook = None
         try:
-            self.kb_hook = keyboard.hook(self._on_keyboard_event, suppress=False)
+            self.kb_hook = load_keyboard().hook(self._on_keyboard_event, suppress=False)
             logger.info("Global keyboard hook registered")
         except Exception:
             logger.exception("Failed to register keyboard hook")
             raise
+        startup.mark("hook install")
 
         self.status_var = tk.StringVar(value="Stopped")
         self.status_kind = "stopped"
@@ -790,13 +3176,33 @@ class AutoClickerApp:
         self.root.minsize(w, h)
         self.root.resizable(False, False)
 
+        self.root.bind("<Configure>", self._on_root_configure, add="+")
+        self.root.bind("<FocusIn>", lambda e: self.window_guard.set_focused(True), add="+")
+        self.root.bind("<FocusOut>", lambda e: self.window_guard.set_focused(False), add="+")
+        self.root.update_idletasks()
+        self._on_root_configure()
+
         self.root.protocol("WM_DELETE_WINDOW", self._on_close)
         self.root.after(50, self._drain_ui_queue)
         if WATCH_SYSTEM_THEME and UI_THEME_MODE == "system":
             self.root.after(1000, self._theme_watch_tick)
 
+        startup.mark("ui build")
         logger.debug("UI initialized")
 
+    def _on_root_configure(self, event=None):
+        if event is not None and event.widget is not self.root:
+            return
+        try:
+            self.window_guard.update_geometry(
+                self.root.winfo_rootx(),
+                self.root.winfo_rooty(),
+                self.root.winfo_width(),
+                self.root.winfo_height(),
+            )
+        except Exception as e:
+            logger.debug("Window geometry update failed: %s", e)
+
     def _is_elevated(self):
         try:
             return bool(ctypes.windll.shell32.IsUserAnAdmin())
@@ -805,9 +3211,11 @@ class AutoClickerApp:
             return False
 
     def _restart_elevated(self):
+        from subprocess import list2cmdline
+
         exe, args = self_launch_command()
 
-        params = subprocess.list2cmdline(args)
+        params = list2cmdline(args)
 
         logger.info("Relaunching elevated | exe=%s | params=%s", exe, params)
         ctypes.set_last_error(0)
@@ -821,8 +3229,7 @@ class AutoClickerApp:
                 os.path.exists(exe),
             )
 
-            with self.config_lock:
-                self.config["elevate_on_start"] = False
+            self._update_config(elevate_on_start=False)
             self._save_config()
 
             self.vars["elevate_on_start"].set(False)
@@ -844,12 +3251,31 @@ class AutoClickerApp:
             self.elev_state_var.set("Not elevated")
             self.elev_state_label.configure(style="ElevatedNo.TLabel")
 
+    def _on_trace_toggle(self):
+        if self.trace_var.get():
+            trace.clear()
+            trace.enabled = True
+            logger.info("Trace enabled | capacity=%s", trace.capacity)
+            self._set_status("Tracing", "info")
+            return
+        trace.enabled = False
+        self._dump_trace()
+
+    def _dump_trace(self):
+        path = TRACES_DIR / time.strftime("trace-%Y%m%d-%H%M%S.bin")
+        try:
+            records = trace.dump(path)
+        except Exception:
+            logger.exception("Failed to dump trace")
+            self._set_status("Trace dump failed, check logs", "error")
+            return
+        self._set_status(f"Trace saved: {path.name} ({records} records)", "info")
+
     def _on_elevate_toggle(self):
         want = bool(self.vars["elevate_on_start"].get())
 
-        with self.config_lock:
-            self.config["elevate_on_start"] = want
-        self._save_config()
+        self._update_config(elevate_on_start=want)
+        self._save_config(immediate=want)
 
         if want and not self._is_elevated():
             self._set_status("Requesting admin (UAC)...", "info")
@@ -866,43 +3292,90 @@ class AutoClickerApp:
         self._set_elevation_ui()
         self._sync_footer_status()
 
-    def _load_config(self):
-        cfg = default_config()
+    def _config_data(self):
+        return self.config_snapshot.to_dict()
+
+    def _on_profile_switched(self, outgoing, name):
+        previous = outgoing.get("profile_name")
+        if previous and previous in self.profiles.binds():
+            try:
+                self.profiles.save(previous, outgoing.to_dict())
+            except Exception:
+                logger.exception("Failed to save profile %s", previous)
+        self.persister.request_save()
+        self.ui_queue.put(("profile_switched", name))
+
+    def _save_profile(self, name=None):
+        name = str(self.profile_var.get() if name is None else name).strip()
+        if not self.profiles.valid_name(name):
+            self._set_status("Profile name: letters, digits, space, _ . - (max 40)", "warn")
+            return
+        self._update_config(profile_name=name)
         try:
-            CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-            if CONFIG_PATH.exists():
-                loaded = json.loads(CONFIG_PATH.read_text(encoding="utf-8"))
-                if isinstance(loaded, dict):
-                    self._merge_config(cfg, loaded)
-                logger.info("Config loaded from %s", CONFIG_PATH)
-            else:
-                logger.info("Config file not found, using defaults")
+            self.profiles.save(name, self.config_snapshot.to_dict())
         except Exception:
-            logger.exception("Failed to load config, using defaults")
-        return cfg
-
-    def _merge_config(self, base, loaded):
-        for key, value in loaded.items():
-            if key not in base:
-                continue
-            if isinstance(base[key], dict) and isinstance(value, dict):
-                for inner_key, inner_val in value.items():
-                    if inner_key in base[key]:
-                        base[key][inner_key] = inner_val
-            else:
-                base[key] = value
+            logger.exception("Failed to save profile %s", name)
+            self._set_status(f"Profile save failed: {name}", "error")
+            return
+        self._save_config()
+        self._rebuild_hotkeys()
+        self._refresh_profile_list()
+        self._set_status(f"Profile saved: {name}", "info")
+
+    def _delete_profile(self):
+        name = str(self.profile_var.get()).strip()
+        if not self.profiles.delete(name):
+            self._set_status(f"No saved profile named {name}", "warn")
+            return
+        if self.config_snapshot.get("profile_name") == name:
+            self._update_config(profile_name="")
+            self._save_config()
+        self._rebuild_hotkeys()
+        self._refresh_profile_list()
+        self._set_status(f"Profile deleted: {name}", "info")
+
+    def _on_profile_selected(self):
+        name = str(self.profile_var.get()).strip()
+        if not self._switch_profile(name):
+            self._refresh_profile_list()
+
+    def _sync_profile_bind(self):
+        name = self.config_snapshot.get("profile_name")
+        if name in self.profiles.binds():
+            self._save_profile(name)
+
+    def _toggle_recording(self):
+        with self.recorder_lock:
+            recorder = self.recorder
+            if recorder is None:
+                path = RECORDINGS_DIR / time.strftime("recording-%Y%m%d-%H%M%S.tbrec")
+                ignore = [(self.config_snapshot.get("record_bind") or {}).get("scan_code")]
+                try:
+                    self.recorder = InputRecorder(path, ignore_scans=ignore)
+                except Exception:
+                    logger.exception("Failed to start recording")
+                    self.ui_queue.put(("status", "Recording failed, check logs", "error"))
+                    return
+                self.ui_queue.put(("status", f"Recording to {path.name}", "info"))
+                return
+            self.recorder = None
 
-    def _save_config(self):
-        with self.config_lock:
-            data = copy.deepcopy(self.config)
         try:
-            CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-            temp_path = CONFIG_PATH.with_suffix(".tmp")
-            temp_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
-            temp_path.replace(CONFIG_PATH)
-            logger.debug("Config saved")
+            records = recorder.close()
         except Exception:
-            logger.exception("Failed to save config")
+            logger.exception("Failed to finish recording")
+            self.ui_queue.put(("status", "Recording failed, check logs", "error"))
+            return
+        self.ui_queue.put(("status", f"Recording saved: {recorder.path.name} ({records} events)", "info"))
+
+    def _refresh_profile_list(self):
+        self.profile_combo.configure(values=self.profiles.names())
+        self.profile_var.set(self.config_snapshot.get("profile_name", ""))
+
+    def _save_config(self, immediate=False):
+        self.persister.request_save()
+        if immediate:
+            self.persister.flush()
 
     def _theme_watch_tick(self):
         try:
@@ -1129,6 +3602,24 @@ class AutoClickerApp:
         self.static_var_entry = ttk.Entry(self.static_row, textvariable=self.vars["static_variance"], width=10)
         self.static_var_entry.grid(row=0, column=3, sticky="ew", padx=(6, 0))
 
+        ttk.Label(self.static_row, text="Jitter").grid(row=1, column=0, sticky="w", pady=(6, 0))
+        self.vars["variance_mode"] = tk.StringVar()
+        self.variance_mode_combo = ttk.Combobox(
+            self.static_row,
+            state="readonly",
+            textvariable=self.vars["variance_mode"],
+            values=list(JITTER_DISTRIBUTIONS),
+            width=14,
+        )
+        self.variance_mode_combo.grid(row=1, column=1, sticky="w", padx=(6, 12), pady=(6, 0))
+        HoverTip(
+            self.variance_mode_combo,
+            "uniform: CPS re-rolled within +/- variance every 250ms\n"
+            "gaussian: CPS drawn from a normal curve clipped to +/- variance\n"
+            "lognormal: like gaussian but skewed toward occasional faster bursts\n"
+            "humanized: gaussian CPS plus per-click timing wobble",
+        )
+
         self.interval_row = ttk.Frame(cps_frame)
         self.interval_row.grid(row=2, column=0, columnspan=2, sticky="ew", padx=10, pady=(0, 8))
         for col in range(8):
@@ -1170,6 +3661,8 @@ class AutoClickerApp:
         output_frame.grid(row=1, column=0, sticky="ew", pady=section_pad)
         output_frame.columnconfigure(0, weight=1)
         output_frame.columnconfigure(1, weight=1)
+        output_frame.columnconfigure(2, weight=1)
+        output_frame.columnconfigure(3, weight=1)
 
         self.vars["output_mode"] = tk.StringVar()
         ttk.Radiobutton(
@@ -1186,9 +3679,23 @@ class AutoClickerApp:
             variable=self.vars["output_mode"],
             command=self._on_any_ui_change,
         ).grid(row=0, column=1, sticky="w", padx=10, pady=(8, 6))
+        ttk.Radiobutton(
+            output_frame,
+            text="Sequence",
+            value="sequence",
+            variable=self.vars["output_mode"],
+            command=self._on_any_ui_change,
+        ).grid(row=0, column=2, sticky="w", padx=10, pady=(8, 6))
+        ttk.Radiobutton(
+            output_frame,
+            text="Playback",
+            value="playback",
+            variable=self.vars["output_mode"],
+            command=self._on_any_ui_change,
+        ).grid(row=0, column=3, sticky="w", padx=10, pady=(8, 6))
 
         self.mouse_row = ttk.Frame(output_frame)
-        self.mouse_row.grid(row=1, column=0, columnspan=2, sticky="ew", padx=10, pady=(0, 8))
+        self.mouse_row.grid(row=1, column=0, columnspan=4, sticky="ew", padx=10, pady=(0, 8))
         self.mouse_row.columnconfigure(3, weight=1)
 
         ttk.Label(self.mouse_row, text="Button").grid(row=0, column=0, sticky="w")
@@ -1209,7 +3716,7 @@ class AutoClickerApp:
         HoverTip(self.lock_cursor_check, "Lock Cursor in place while enabled")
 
         self.keyboard_row = ttk.Frame(output_frame)
-        self.keyboard_row.grid(row=2, column=0, columnspan=2, sticky="ew", padx=10, pady=(0, 8))
+        self.keyboard_row.grid(row=2, column=0, columnspan=4, sticky="ew", padx=10, pady=(0, 8))
         self.keyboard_row.columnconfigure(0, weight=1)
 
         self.capture_output_button = ttk.Button(
@@ -1219,6 +3726,35 @@ class AutoClickerApp:
         )
         self.capture_output_button.grid(row=0, column=0, sticky="ew")
 
+        self.sequence_row = ttk.Frame(output_frame)
+        self.sequence_row.grid(row=3, column=0, columnspan=4, sticky="ew", padx=10, pady=(0, 8))
+        self.sequence_row.columnconfigure(0, weight=1)
+
+        self.vars["sequence_script"] = tk.StringVar()
+        self.sequence_entry = ttk.Entry(self.sequence_row, textvariable=self.vars["sequence_script"])
+        self.sequence_entry.grid(row=0, column=0, sticky="ew")
+        self.sequence_entry.bind("<FocusIn>", self._on_text_input_focus_in, add="+")
+        self.sequence_entry.bind("<FocusOut>", self._on_text_input_focus_out, add="+")
+        HoverTip(
+            self.sequence_entry,
+            "Commands separated by ; and repeated while running:\n"
+            "click [left|right|middle] [n], mdown/mup [button]\n"
+            "tap <key> [n], down <key>, up <key> (key name, or raw scan code with 0x like 0x1E)\n"
+            "wait <ms>, move <x> <y>, loop <n> { ... }",
+        )
+
+        self.playback_row = ttk.Frame(output_frame)
+        self.playback_row.grid(row=4, column=0, columnspan=4, sticky="ew", padx=10, pady=(0, 8))
+        self.playback_row.columnconfigure(0, weight=1)
+
+        self.vars["playback_file"] = tk.StringVar()
+        self.playback_entry = ttk.Entry(self.playback_row, textvariable=self.vars["playback_file"])
+        self.playback_entry.grid(row=0, column=0, sticky="ew")
+        self.playback_entry.bind("<FocusIn>", self._on_text_input_focus_in, add="+")
+        self.playback_entry.bind("<FocusOut>", self._on_text_input_focus_out, add="+")
+        ttk.Button(self.playback_row, text="Browse", command=self._browse_playback_file).grid(row=0, column=1, sticky="e", padx=(6, 0))
+        HoverTip(self.playback_entry, "Recording (.tbrec) replayed in a loop while running")
+
         binds_frame = ttk.Frame(content_col, style="Section.TFrame")
         binds_frame.grid(row=2, column=0, sticky="ew", pady=section_pad)
         binds_frame.columnconfigure(0, weight=1)
@@ -1246,8 +3782,40 @@ class AutoClickerApp:
         )
         self.stop_bind_button.grid(row=1, column=1, sticky="ew", padx=(2, 10), pady=(0, 8))
 
+        self.record_bind_button = ttk.Button(
+            binds_frame,
+            text="Record [Not Set]",
+            command=lambda: self._start_capture("record_bind"),
+        )
+        self.record_bind_button.grid(row=2, column=0, columnspan=2, sticky="ew", padx=10, pady=(0, 8))
+        HoverTip(self.record_bind_button, "Hotkey that starts and stops recording keyboard and mouse input\nRecordings are saved to the recordings folder next to config.json")
+
+        profile_frame = ttk.Frame(content_col, style="Section.TFrame")
+        profile_frame.grid(row=3, column=0, sticky="ew", pady=section_pad)
+        profile_frame.columnconfigure(1, weight=1)
+
+        ttk.Label(profile_frame, text="Profile").grid(row=0, column=0, sticky="w", padx=(10, 6), pady=8)
+        self.profile_var = tk.StringVar()
+        self.profile_combo = ttk.Combobox(profile_frame, textvariable=self.profile_var, width=14)
+        self.profile_combo.grid(row=0, column=1, sticky="ew", pady=8)
+        self.profile_combo.bind("<<ComboboxSelected>>", lambda e: self._on_profile_selected())
+        self.profile_combo.bind("<FocusIn>", self._on_text_input_focus_in, add="+")
+        self.profile_combo.bind("<FocusOut>", self._on_text_input_focus_out, add="+")
+
+        self.profile_save_button = ttk.Button(profile_frame, text="Save", command=self._save_profile)
+        self.profile_save_button.grid(row=0, column=2, sticky="ew", padx=(6, 2), pady=8)
+        HoverTip(self.profile_save_button, "Save current settings under this profile name\nRight-click to delete the named profile")
+
+        self.profile_bind_button = ttk.Button(
+            profile_frame,
+            text="Switch [Not Set]",
+            command=lambda: self._start_capture("profile_bind"),
+        )
+        self.profile_bind_button.grid(row=0, column=3, sticky="ew", padx=(2, 10), pady=8)
+        HoverTip(self.profile_bind_button, "Hotkey that switches to this profile from anywhere")
+
         controls_frame = ttk.Frame(content_col, style="Section.TFrame")
-        controls_frame.grid(row=3, column=0, sticky="ew", pady=(16, 2))
+        controls_frame.grid(row=4, column=0, sticky="ew", pady=(16, 2))
         controls_frame.columnconfigure(0, weight=1)
         controls_frame.columnconfigure(1, weight=1)
 
@@ -1258,12 +3826,13 @@ class AutoClickerApp:
         self.manual_stop_btn.grid(row=0, column=1, sticky="ew", padx=(2, 10), pady=8)
 
         footer = ttk.Frame(content_col)
-        footer.grid(row=4, column=0, sticky="ew", pady=(2, 0))
+        footer.grid(row=5, column=0, sticky="ew", pady=(2, 0))
         footer.columnconfigure(0, weight=1)
         footer.columnconfigure(1, weight=0)
 
         self.status_label = ttk.Label(footer, textvariable=self.footer_status_var, style="StatusStopped.TLabel")
         self.status_label.grid(row=0, column=0, sticky="w")
+        HoverTip(self.status_label, self._latency_tip_text)
 
         right = ttk.Frame(footer)
         right.grid(row=0, column=1, sticky="e")
@@ -1282,6 +3851,17 @@ class AutoClickerApp:
         )
         elev_cb.grid(row=0, column=1, sticky="e")
 
+        self.trace_var = tk.BooleanVar(value=trace.enabled)
+        trace_cb = ttk.Checkbutton(right, text="Trace", variable=self.trace_var, command=self._on_trace_toggle)
+        trace_cb.grid(row=0, column=2, sticky="e", padx=(10, 0))
+        trace_cb.bind("<Button-3>", lambda e: self._dump_trace())
+        HoverTip(
+            trace_cb,
+            "Record every sent input, hotkey, start/stop, blocked period and config change into\n"
+            "an in-memory ring buffer. Unchecking (or right-clicking) saves it to the traces folder\n"
+            "for: python clicker.py analyze <trace.bin>",
+        )
+
         HoverTip(
             elev_cb,
             "Elevation helps in some apps (like games) where synthetic inputs or global key hooks\n"
@@ -1292,10 +3872,14 @@ class AutoClickerApp:
         self.start_bind_button.bind("<Button-3>", lambda e: self._clear_bind("start_bind"))
         self.stop_bind_button.bind("<Button-3>", lambda e: self._clear_bind("stop_bind"))
         self.capture_output_button.bind("<Button-3>", lambda e: self._clear_bind("output_key"))
+        self.profile_bind_button.bind("<Button-3>", lambda e: self._clear_bind("profile_bind"))
+        self.record_bind_button.bind("<Button-3>", lambda e: self._clear_bind("record_bind"))
+        self.profile_save_button.bind("<Button-3>", lambda e: self._delete_profile())
 
         for key in [
             "static_cps",
             "static_variance",
+            "variance_mode",
             "interval_hours",
             "interval_minutes",
             "interval_seconds",
@@ -1304,17 +3888,40 @@ class AutoClickerApp:
             "output_mode",
             "mouse_button",
             "lock_cursor",
+            "sequence_script",
+            "playback_file",
             "toggle_mode",
         ]:
             self.vars[key].trace_add("write", self._on_var_trace)
 
+    def _latency_tip_text(self):
+        data = self.worker.latency.summary()
+        if not data["activations"]:
+            return "Start latency: no activations yet"
+        lines = [f"Start latency ({data['activations']} activations)"]
+        for name, _, _ in LatencyTracker.SEGMENTS:
+            seg = data[name]
+            lines.append(f"{name.replace('_', ' ')}: mean {seg['mean_us']}us, p99 <= {seg['p99_us_le']}us, max {seg['max_us']}us")
+        return "\n".join(lines)
+
+    def _browse_playback_file(self):
+        initial = RECORDINGS_DIR if RECORDINGS_DIR.is_dir() else CONFIG_DIR
+        path = filedialog.askopenfilename(
+            parent=self.root,
+            initialdir=str(initial),
+            filetypes=[("Recordings", "*.tbrec"), ("All files", "*.*")],
+        )
+        if path:
+            self.vars["playback_file"].set(path)
+
     def _clear_bind(self, target_key):
         with self.capture_lock:
             if self.capture_target is not None:
                 return
 
-        with self.config_lock:
-            self.config[target_key] = default_bind()
+        self._update_config(**{target_key: default_bind()})
+        if target_key == "profile_bind":
+            self._sync_profile_bind()
 
         self._save_config()
         self._refresh_bind_buttons()
@@ -1325,19 +3932,21 @@ class AutoClickerApp:
 
     def _load_vars_from_config(self):
         self._trace_guard = True
-        with self.config_lock:
-            cfg = copy.deepcopy(self.config)
+        cfg = self.config_snapshot
 
         for key in [
             "cps_mode",
             "static_cps",
             "static_variance",
+            "variance_mode",
             "interval_hours",
             "interval_minutes",
             "interval_seconds",
             "interval_milliseconds",
             "output_mode",
             "mouse_button",
+            "sequence_script",
+            "playback_file",
             "toggle_mode",
         ]:
             if key in self.vars:
@@ -1348,6 +3957,7 @@ class AutoClickerApp:
 
         self._trace_guard = False
         self._refresh_bind_buttons()
+        self._refresh_profile_list()
 
         try:
             self._set_elevation_ui()
@@ -1367,27 +3977,32 @@ class AutoClickerApp:
         self.worker.nudge()
 
     def _write_config_from_vars(self):
-        with self.config_lock:
-            for key in [
-                "cps_mode",
-                "static_cps",
-                "static_variance",
-                "interval_hours",
-                "interval_minutes",
-                "interval_seconds",
-                "interval_milliseconds",
-                "output_mode",
-                "mouse_button",
-                "toggle_mode",
-            ]:
-                self.config[key] = self.vars[key].get()
-
-            self.config["elevate_on_start"] = bool(self.vars["elevate_on_start"].get())
-            self.config["lock_cursor"] = bool(self.vars["lock_cursor"].get())
+        changes = {}
+        for key in [
+            "cps_mode",
+            "static_cps",
+            "static_variance",
+            "variance_mode",
+            "interval_hours",
+            "interval_minutes",
+            "interval_seconds",
+            "interval_milliseconds",
+            "output_mode",
+            "mouse_button",
+            "sequence_script",
+            "playback_file",
+            "toggle_mode",
+        ]:
+            changes[key] = self.vars[key].get()
+
+        changes["elevate_on_start"] = bool(self.vars["elevate_on_start"].get())
+        changes["lock_cursor"] = bool(self.vars["lock_cursor"].get())
+        self._update_config(**changes)
 
     def _set_bind(self, target_key, bind_data):
-        with self.config_lock:
-            self.config[target_key] = bind_data
+        self._update_config(**{target_key: bind_data})
+        if target_key == "profile_bind":
+            self._sync_profile_bind()
         self._save_config()
         self._refresh_bind_buttons()
         self._refresh_validation()
@@ -1406,16 +4021,18 @@ class AutoClickerApp:
         return f"{display_name} (0x{scan_code:X})"
 
     def _refresh_bind_buttons(self):
-        with self.config_lock:
-            cfg = copy.deepcopy(self.config)
+        cfg = self.config_snapshot
 
         self.start_bind_button.configure(text=f"Start [{self._format_bind(cfg['start_bind'])}]")
         self.stop_bind_button.configure(text=f"Stop [{self._format_bind(cfg['stop_bind'])}]")
         self.capture_output_button.configure(text=f"Output [{self._format_bind(cfg['output_key'])}]")
+        self.profile_bind_button.configure(text=f"Switch [{self._format_bind(cfg['profile_bind'])}]")
+        self.record_bind_button.configure(text=f"Record [{self._format_bind(cfg['record_bind'])}]")
 
     def _apply_state(self):
         static_enabled = self.vars["cps_mode"].get() == "static"
-        output_mouse = self.vars["output_mode"].get() == "mouse"
+        output_mode = self.vars["output_mode"].get()
+        output_mouse = output_mode == "mouse"
 
         if static_enabled:
             self.static_row.grid()
@@ -1430,12 +4047,25 @@ class AutoClickerApp:
             self.interval_seconds_entry.configure(state="normal")
             self.interval_ms_entry.configure(state="normal")
 
+        if output_mode == "sequence":
+            self.sequence_row.grid()
+        else:
+            self.sequence_row.grid_remove()
+
+        if output_mode == "playback":
+            self.playback_row.grid()
+        else:
+            self.playback_row.grid_remove()
+
         if output_mouse:
             self.mouse_row.grid()
             self.keyboard_row.grid_remove()
             self.mouse_button_combo.configure(state="readonly")
             self.lock_cursor_check.configure(state="normal")
             self.capture_output_button.configure(state="normal")
+        elif output_mode in ("sequence", "playback"):
+            self.mouse_row.grid_remove()
+            self.keyboard_row.grid_remove()
         else:
             self.mouse_row.grid_remove()
             self.keyboard_row.grid()
@@ -1443,111 +4073,12 @@ class AutoClickerApp:
             self.lock_cursor_check.configure(state="disabled")
             self.capture_output_button.configure(state="normal")
 
-    def _parse_float(self, text_value, field_name, minimum=None):
-        try:
-            value = float(str(text_value).strip())
-        except Exception:
-            return False, f"{field_name} must be a number"
-        if minimum is not None and value < minimum:
-            return False, f"{field_name} must be >= {minimum}"
-        return True, value
-
-    def _parse_int(self, text_value, field_name, minimum=None):
-        try:
-            value = int(str(text_value).strip() or "0")
-        except Exception:
-            return False, f"{field_name} must be an integer"
-        if minimum is not None and value < minimum:
-            return False, f"{field_name} must be >= {minimum}"
-        return True, value
-
-    def _bind_same(self, a, b):
-        if not a or not b:
-            return False
-        return a.get("scan_code") is not None and a.get("scan_code") == b.get("scan_code")
-
-    def _build_runtime_config(self):
-        with self.config_lock:
-            cfg = copy.deepcopy(self.config)
-
-        start_bind = cfg.get("start_bind") or {}
-        stop_bind = cfg.get("stop_bind") or {}
-        output_key = cfg.get("output_key") or {}
-
-        if start_bind.get("scan_code") is None:
-            return {"ok": False, "error": "Start bind is required"}
-
-        if stop_bind.get("scan_code") is not None and self._bind_same(start_bind, stop_bind):
-            return {"ok": False, "error": "Start bind and stop bind cannot be the same"}
-
-        if cfg.get("toggle_mode") == "separate_toggle" and stop_bind.get("scan_code") is None:
-            return {"ok": False, "error": "Separate toggle requires a stop bind"}
-
-        if cfg.get("output_mode") == "keyboard":
-            if output_key.get("scan_code") is None:
-                return {"ok": False, "error": "Output key is required in keyboard mode"}
-            if self._bind_same(start_bind, output_key):
-                return {"ok": False, "error": "Start bind cannot match output key"}
-            if stop_bind.get("scan_code") is not None and self._bind_same(stop_bind, output_key):
-                return {"ok": False, "error": "Stop bind cannot match output key"}
-
-        if cfg.get("cps_mode") == "static":
-            ok, static_cps = self._parse_float(cfg.get("static_cps", ""), "Static CPS", 0.001)
-            if not ok:
-                return {"ok": False, "error": static_cps}
-            ok, variance = self._parse_float(cfg.get("static_variance", ""), "Variance", 0.0)
-            if not ok:
-                return {"ok": False, "error": variance}
-            return {
-                "ok": True,
-                "cps_mode": "static",
-                "static_cps": static_cps,
-                "static_variance": variance,
-                "output_mode": cfg.get("output_mode"),
-                "mouse_button": cfg.get("mouse_button"),
-                "lock_cursor": bool(cfg.get("lock_cursor", False)),
-                "output_key": output_key,
-                "toggle_mode": cfg.get("toggle_mode"),
-                "start_bind": start_bind,
-                "stop_bind": stop_bind,
-            }
-
-        ok, h = self._parse_int(cfg.get("interval_hours", ""), "Hours", 0)
-        if not ok:
-            return {"ok": False, "error": h}
-        ok, m = self._parse_int(cfg.get("interval_minutes", ""), "Minutes", 0)
-        if not ok:
-            return {"ok": False, "error": m}
-        ok, s = self._parse_int(cfg.get("interval_seconds", ""), "Seconds", 0)
-        if not ok:
-            return {"ok": False, "error": s}
-        ok, ms = self._parse_int(cfg.get("interval_milliseconds", ""), "Milliseconds", 0)
-        if not ok:
-            return {"ok": False, "error": ms}
-
-        interval_seconds = (h * 3600) + (m * 60) + s + (ms / 1000.0)
-        if interval_seconds <= 0:
-            return {"ok": False, "error": "Interval must be greater than 0"}
-
-        return {
-            "ok": True,
-            "cps_mode": "interval",
-            "interval_seconds": interval_seconds,
-            "output_mode": cfg.get("output_mode"),
-            "mouse_button": cfg.get("mouse_button"),
-            "lock_cursor": bool(cfg.get("lock_cursor", False)),
-            "output_key": output_key,
-            "toggle_mode": cfg.get("toggle_mode"),
-            "start_bind": start_bind,
-            "stop_bind": stop_bind,
-        }
-
     def _refresh_validation(self):
         runtime = self._build_runtime_config()
-        if runtime["ok"]:
+        if runtime.ok:
             self.validation_error = ""
         else:
-            self.validation_error = runtime["error"]
+            self.validation_error = runtime.error
         self._sync_footer_status()
 
     def _sync_footer_status(self):
@@ -1580,6 +4111,10 @@ class AutoClickerApp:
             self.start_bind_button.configure(text="Start [...]")
         elif target_key == "stop_bind":
             self.stop_bind_button.configure(text="Stop [...]")
+        elif target_key == "profile_bind":
+            self.profile_bind_button.configure(text="Switch [...]")
+        elif target_key == "record_bind":
+            self.record_bind_button.configure(text="Record [...]")
         else:
             self.capture_output_button.configure(text="Output [...]")
 
@@ -1604,7 +4139,7 @@ class AutoClickerApp:
                     continue
 
                 name = getattr(event, "name", "") or "key"
-                vk_code = WinInput.map_vk(int(scan_code))
+                vk_code = self.input_backend.map_vk(int(scan_code))
 
                 bind_data = {
                     "name": str(name),
@@ -1658,6 +4193,12 @@ class AutoClickerApp:
                     self._finish_capture_ui(target_key)
                     self._set_status(f"Capture error: {err_text}", "error")
 
+                elif action == "profile_switched":
+                    self._load_vars_from_config()
+                    self._apply_state()
+                    self._refresh_validation()
+                    self._set_status(f"Profile: {item[1]}", "info")
+
         except queue.Empty:
             pass
         except Exception:
@@ -1681,110 +4222,458 @@ class AutoClickerApp:
         except Exception:
             self.text_input_focused.clear()
             return
-        if widget_class in ("Entry", "TEntry", "Spinbox", "Text"):
+        if widget_class in ("Entry", "TEntry", "Spinbox", "Text") or focused_widget is self.profile_combo:
             self.text_input_focused.set()
         else:
             self.text_input_focused.clear()
 
+    def _start_block_reason(self):
+        if self.text_input_focused.is_set():
+            return "text input focused"
+        if self.window_guard.is_cursor_in_window():
+            return "app in foreground and cursor inside window"
+        return None
+
     def _on_keyboard_event(self, event):
-        with self.capture_lock:
-            if self.capture_target is not None:
-                return
+        if self.capture_target is not None:
+            return
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.on_key(event)
+        self.hotkeys.hook(event)
 
+    def _on_close(self):
+        logger.info("Closing app")
         try:
-            scan_code = int(getattr(event, "scan_code", -1))
+            if self.kb_hook is not None:
+                keyboard.unhook(self.kb_hook)
+                logger.debug("Keyboard hook removed")
         except Exception:
-            return
-
-        event_type = getattr(event, "event_type", "")
-        if event_type not in ("down", "up"):
-            return
-
-        is_down = event_type == "down"
-
-        with self.config_lock:
-            start_scan = self.config["start_bind"].get("scan_code")
-            stop_scan = self.config["stop_bind"].get("scan_code")
-            toggle_mode = self.config.get("toggle_mode", "press")
-
-        if TRACE_HOTKEY_EVENTS and DEBUG_MODE:
-            logger.debug(
-                "Hotkey event\t| type=%s\t| scan=0x%X\t| start=%s\t| stop=%s\t| mode=%s",
-                event_type,
-                scan_code,
-                None if start_scan is None else f"0x{int(start_scan):X}",
-                None if stop_scan is None else f"0x{int(stop_scan):X}",
-                toggle_mode,
-            )
-
-        with self.hotkey_lock:
-            if is_down:
-                if scan_code in self.pressed_scans:
-                    return
-                self.pressed_scans.add(scan_code)
-            else:
-                if scan_code in self.pressed_scans:
-                    self.pressed_scans.remove(scan_code)
+            logger.exception("Failed to unhook keyboard")
+        self.hotkeys.close()
+        if self.recorder is not None:
+            self._toggle_recording()
+        self.worker.close()
+        self.persister.close()
+        self.root.destroy()
 
-        if stop_scan is not None and scan_code == int(stop_scan) and is_down:
-            self.worker.set_active(False, "stop bind")
-            return
 
-        if start_scan is None or scan_code != int(start_scan):
-            return
+class HeadlessClicker(ClickerController):
+    def __init__(self, cfg):
+        super().__init__(cfg)
+        self.kb_hook = None
 
-        ignore_start_for_window = is_down and WinFocus.is_cursor_in_window(self.hwnd)
-        ignore_start_for_text_input = is_down and self.text_input_focused.is_set()
-        if ignore_start_for_window or ignore_start_for_text_input:
-            if ignore_start_for_text_input:
-                logger.debug("Start hotkey ignored (text input focused)")
-            else:
-                logger.debug("Start hotkey ignored (app in foreground and cursor inside window)")
-            return
+        self.input_backend = create_input_backend()
+        self.profiles = ProfileStore(PROFILES_DIR, self.input_backend)
+        self.worker = ClickerWorker(self._build_runtime_config, self.ui_queue, backend=self.input_backend)
+        self.hotkeys = HotkeyDispatcher(self.worker, profile_switcher=self._switch_profile)
+        self._rebuild_hotkeys()
+        startup.mark("worker")
 
-        if toggle_mode == "press":
-            if is_down:
-                self.worker.set_active(True, "hold bind")
-            else:
-                self.worker.set_active(False, "hold bind")
-            return
+    def start(self, profile=""):
+        if profile and profile != self.config_snapshot.get("profile_name") and not self._switch_profile(profile):
+            return False, f"Profile could not be loaded: {profile}"
 
-        if toggle_mode == "toggle":
-            if is_down:
-                self.worker.toggle_active()
-            return
+        runtime = self._build_runtime_config()
+        if not runtime.ok:
+            return False, runtime.error
+        startup.mark("runtime plan")
+        if load_keyboard() is None:
+            return False, "keyboard module is not installed"
+
+        self.kb_hook = keyboard.hook(self.hotkeys.hook, suppress=False)
+        startup.mark("hook install")
+        logger.info(
+            "Headless clicker ready | profile=%s | start=%s | channels=%s",
+            self.config_snapshot.get("profile_name") or "-",
+            (self.config_snapshot.get("start_bind") or {}).get("name") or "-",
+            len(runtime.channels),
+        )
+        return True, runtime
 
-        if toggle_mode == "separate_toggle":
-            if is_down:
-                self.worker.set_active(True, "stop bind")
-            return
+    def run(self):
+        while True:
+            item = self.ui_queue.get()
+            if item[0] == "close":
+                return
+            if item[0] == "status":
+                logger.info("Status | %s", item[1])
 
     def _on_close(self):
-        logger.info("Closing app")
+        logger.info("Closing headless clicker")
         try:
             if self.kb_hook is not None:
                 keyboard.unhook(self.kb_hook)
                 logger.debug("Keyboard hook removed")
         except Exception:
             logger.exception("Failed to unhook keyboard")
+        self.hotkeys.close()
         self.worker.close()
-        self.root.destroy()
+        self.ui_queue.put(("close",))
+
+
+TRACE_KIND_NAMES = {
+    TRACE_EMIT: "emit",
+    TRACE_HOOK_DOWN: "hook_down",
+    TRACE_HOOK_UP: "hook_up",
+    TRACE_START: "start",
+    TRACE_STOP: "stop",
+    TRACE_BLOCKED: "blocked",
+    TRACE_UNBLOCKED: "unblocked",
+    TRACE_CONFIG: "config",
+}
+TRACE_COLUMNS = (("ts", "q", "<i8"), ("scheduled", "q", "<i8"), ("actual", "q", "<i8"), ("code", "H", "<u2"), ("count", "H", "<u2"), ("kind", "B", "u1"), ("channel", "B", "u1"))
+ANALYZE_GAP_PERIODS = 4.0
+ANALYZE_WINDOW_S = 1.0
+ANALYZE_MAX_ROWS = 30
+ANALYZE_HIST_EDGES_US = tuple([0.0] + [float(1 << i) for i in range(21)])
+
+
+def read_trace(path):
+    load_numpy()
+    path = Path(path)
+    with open(path, "rb") as f:
+        raw = f.read(TRACE_HEADER.size)
+        if len(raw) < TRACE_HEADER.size:
+            raise ValueError(f"{path.name} is not a trace file")
+        magic, version, record_size, count, first_seq, wall_ns, perf_ns = TRACE_HEADER.unpack(raw)
+        if magic != TRACE_MAGIC:
+            raise ValueError(f"{path.name} is not a trace file")
+        if version != TRACE_VERSION or record_size != TRACE_RECORD.size:
+            raise ValueError(f"{path.name} has unsupported trace version {version}")
+
+        count = min(count, (path.stat().st_size - TRACE_HEADER.size) // record_size)
+        header = {"records": count, "overwritten": first_seq, "wall_ns": wall_ns, "perf_ns": perf_ns}
+
+        if np is not None:
+            dtype = np.dtype([(name, np_code) for name, _code, np_code in TRACE_COLUMNS])
+            if not count:
+                return header, {name: np.zeros(0, dtype=dtype[name]) for name, _code, _np_code in TRACE_COLUMNS}
+            data = np.memmap(path, dtype=dtype, mode="r", offset=TRACE_HEADER.size, shape=(count,))
+            return header, {name: np.ascontiguousarray(data[name]) for name, _code, _np_code in TRACE_COLUMNS}
+
+        columns = {name: array(code) for name, code, _np_code in TRACE_COLUMNS}
+        appenders = [columns[name].append for name, _code, _np_code in TRACE_COLUMNS]
+        remaining = count
+        while remaining > 0:
+            n = min(remaining, RECORDING_CHUNK_RECORDS)
+            for row in TRACE_RECORD.iter_unpack(f.read(n * record_size)):
+                for append, value in zip(appenders, row):
+                    append(value)
+            remaining -= n
+        return header, columns
+
+
+def _trace_summary(values):
+    if not len(values):
+        return None
+    if np is not None:
+        p50, p95, p99 = np.percentile(values, [50, 95, 99]).tolist()
+        return {"p50": round(p50, 3), "p95": round(p95, 3), "p99": round(p99, 3), "max": round(float(np.max(values)), 3)}
+    ordered = sorted(values)
+    return {
+        "p50": round(_percentile(ordered, 0.5), 3),
+        "p95": round(_percentile(ordered, 0.95), 3),
+        "p99": round(_percentile(ordered, 0.99), 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+def _trace_histogram(abs_us):
+    edges = ANALYZE_HIST_EDGES_US
+    if np is not None:
+        counts = np.histogram(abs_us, bins=list(edges) + [np.inf])[0].tolist()
+    else:
+        counts = [0] * len(edges)
+        for v in abs_us:
+            counts[bisect.bisect_right(edges, v) - 1] += 1
+    return [[edges[i], edges[i + 1] if i + 1 < len(edges) else None, n] for i, n in enumerate(counts) if n]
+
+
+def _trace_bounds(columns):
+    ts, actual = columns["ts"], columns["actual"]
+    if np is not None:
+        emit = columns["kind"] == TRACE_EMIT
+        t0, t1 = int(ts.min()), int(ts.max())
+        if emit.any():
+            t0 = min(t0, int(actual[emit].min()))
+        return t0, t1
+    t0 = min(ts)
+    emit_t0 = min((a for a, k in zip(actual, columns["kind"]) if k == TRACE_EMIT), default=t0)
+    return min(t0, emit_t0), max(ts)
+
+
+def _trace_events(columns):
+    kinds = columns["kind"]
+    if np is not None:
+        idx = np.nonzero(kinds != TRACE_EMIT)[0]
+        rows = zip(columns["ts"][idx].tolist(), kinds[idx].tolist(), columns["channel"][idx].tolist())
+    else:
+        rows = ((columns["ts"][i], k, columns["channel"][i]) for i, k in enumerate(kinds) if k != TRACE_EMIT)
+    return sorted(rows)
+
+
+def _trace_blocked(events, end_ns):
+    spans = []
+    since = None
+    for t, kind, _channel in events:
+        if kind == TRACE_BLOCKED and since is None:
+            since = t
+        elif kind in (TRACE_UNBLOCKED, TRACE_STOP) and since is not None:
+            spans.append((since, t))
+            since = None
+    if since is not None:
+        spans.append((since, end_ns))
+    return spans
+
+
+def _trace_emits(columns, channel):
+    kinds = columns["kind"]
+    if np is not None:
+        mask = (kinds == TRACE_EMIT) & (columns["channel"] == channel)
+        order = np.argsort(columns["actual"][mask], kind="stable")
+        return columns["actual"][mask][order], columns["scheduled"][mask][order], columns["count"][mask][order]
+    rows = sorted(
+        (columns["actual"][i], columns["scheduled"][i], columns["count"][i])
+        for i, k in enumerate(kinds)
+        if k == TRACE_EMIT and columns["channel"][i] == channel
+    )
+    return array("q", [r[0] for r in rows]), array("q", [r[1] for r in rows]), array("H", [r[2] for r in rows])
+
+
+def _trace_intervals_numpy(actual, scheduled, count, config_ts, breaks, gap_periods, window_ns, t0):
+    count_f = count.astype(np.float64)
+    interval = np.diff(actual)
+    target = np.diff(scheduled)
+    per_input = target / np.maximum(count_f[:-1], 1.0)
+
+    segment = np.searchsorted(np.asarray(config_ts, dtype=np.int64), actual[1:])
+    period = np.full(len(interval), np.nan)
+    for seg in np.unique(segment).tolist():
+        mask = segment == seg
+        valid = per_input[mask]
+        valid = valid[valid > 0]
+        if len(valid):
+            period[mask] = np.median(valid)
+
+    with np.errstate(invalid="ignore"):
+        stall = np.nonzero(interval > gap_periods * period)[0]
+    if len(breaks) and len(stall):
+        brk = np.asarray(breaks, dtype=np.int64)
+        crossed = np.searchsorted(brk, actual[stall + 1], "left") - np.searchsorted(brk, actual[stall], "right")
+        stall = stall[crossed == 0]
+
+    window = (actual - t0) // window_ns
+    achieved = np.bincount(window, weights=count_f) * (1e9 / window_ns)
+    rate = 1e9 / np.concatenate((period[:1], period))
+    known = np.isfinite(rate)
+    hits = np.bincount(window[known], minlength=len(achieved))
+    total = np.bincount(window[known], weights=rate[known], minlength=len(achieved))
+    cps = [
+        [round(i * window_ns / 1e9, 3), round(a, 3), round(s / h, 3) if h else None]
+        for i, (a, s, h) in enumerate(zip(achieved.tolist(), total.tolist(), hits.tolist()))
+    ]
+
+    finite = period[np.isfinite(period)]
+    return {
+        "period_ns": float(np.median(finite)) if len(finite) else None,
+        "lateness_us": (actual - scheduled) / 1000.0,
+        "jitter_us": (interval - target) / 1000.0,
+        "stalls": [(int(actual[i]), int(actual[i + 1]), float(period[i])) for i in stall.tolist()],
+        "cps": cps,
+    }
 
 
-def main():
-    logger.info("Launching %s", APP_NAME)
+def _trace_intervals_python(actual, scheduled, count, config_ts, breaks, gap_periods, window_ns, t0):
+    n = len(actual)
+    interval = [actual[i + 1] - actual[i] for i in range(n - 1)]
+    target = [scheduled[i + 1] - scheduled[i] for i in range(n - 1)]
+
+    segment = [bisect.bisect_left(config_ts, actual[i + 1]) for i in range(n - 1)]
+    per_segment = {}
+    for i, seg in enumerate(segment):
+        value = target[i] / max(count[i], 1)
+        if value > 0:
+            per_segment.setdefault(seg, []).append(value)
+    medians = {seg: statistics.median(values) for seg, values in per_segment.items()}
+    period = [medians.get(seg, math.nan) for seg in segment]
+
+    stalls = []
+    for i, gap in enumerate(interval):
+        ref = period[i]
+        if gap > gap_periods * ref and bisect.bisect_left(breaks, actual[i + 1]) == bisect.bisect_right(breaks, actual[i]):
+            stalls.append((actual[i], actual[i + 1], ref))
+
+    achieved = collections.Counter()
+    total = collections.Counter()
+    hits = collections.Counter()
+    for i in range(n):
+        w = (actual[i] - t0) // window_ns
+        achieved[w] += count[i]
+        ref = period[max(0, i - 1)]
+        if not math.isnan(ref):
+            total[w] += 1e9 / ref
+            hits[w] += 1
+    cps = [
+        [round(w * window_ns / 1e9, 3), round(achieved[w] * 1e9 / window_ns, 3), round(total[w] / hits[w], 3) if hits[w] else None]
+        for w in range(max(achieved) + 1)
+    ]
+
+    finite = [p for p in period if not math.isnan(p)]
+    return {
+        "period_ns": statistics.median(finite) if finite else None,
+        "lateness_us": [(a - s) / 1000.0 for a, s in zip(actual, scheduled)],
+        "jitter_us": [(a - b) / 1000.0 for a, b in zip(interval, target)],
+        "stalls": stalls,
+        "cps": cps,
+    }
+
+
+def analyze_trace(path, gap_periods=ANALYZE_GAP_PERIODS, window_s=ANALYZE_WINDOW_S, max_rows=ANALYZE_MAX_ROWS):
+    header, columns = read_trace(path)
+    report = {"path": str(path), "engine": "python" if np is None else "numpy", **header, "channels": []}
+    if not header["records"]:
+        return report
+
+    t0, t1 = _trace_bounds(columns)
+    events = _trace_events(columns)
+    kinds = collections.Counter(columns["kind"].tolist() if np is not None else columns["kind"])
+    config_ts = [t for t, kind, _channel in events if kind == TRACE_CONFIG]
+    blocked = _trace_blocked(events, t1)
+    blocked_starts = [b0 for b0, _b1 in blocked]
+    report.update({
+        "span_s": round((t1 - t0) / 1e9, 6),
+        "kinds": {TRACE_KIND_NAMES.get(k, str(k)): n for k, n in sorted(kinds.items())},
+        "config_changes": len(config_ts),
+        "blocked_periods": len(blocked),
+        "blocked_s": round(sum(b1 - b0 for b0, b1 in blocked) / 1e9, 6),
+    })
+
+    if np is not None:
+        channel_ids = np.unique(columns["channel"][columns["kind"] == TRACE_EMIT]).tolist()
+    else:
+        channel_ids = sorted({c for k, c in zip(columns["kind"], columns["channel"]) if k == TRACE_EMIT})
+
+    window_ns = max(1, int(window_s * 1e9))
+    intervals = _trace_intervals_python if np is None else _trace_intervals_numpy
+    for channel in channel_ids:
+        actual, scheduled, count = _trace_emits(columns, channel)
+        result = {"channel": channel, "emits": len(actual), "inputs": int(count.sum(dtype=np.int64)) if np is not None else sum(count)}
+        report["channels"].append(result)
+        if len(actual) < 2:
+            continue
+
+        breaks = [t for t, kind, c in events if (kind == TRACE_START and c == channel) or (kind == TRACE_STOP and c in (channel, 0xFF))]
+        stats = intervals(actual, scheduled, count, config_ts, breaks, gap_periods, window_ns, t0)
+
+        tags = collections.Counter()
+        stalls = []
+        for a0, a1, ref in stats["stalls"]:
+            reasons = []
+            i = bisect.bisect_right(blocked_starts, a1) - 1
+            if i >= 0 and blocked[i][1] >= a0:
+                reasons.append("blocked")
+            if bisect.bisect_right(config_ts, a1) > bisect.bisect_left(config_ts, a0 - int(ref)):
+                reasons.append("config")
+            tags.update(reasons or ["unexplained"])
+            if len(stalls) < max_rows:
+                stalls.append({
+                    "t_s": round((a0 - t0) / 1e9, 6),
+                    "duration_ms": round((a1 - a0) / 1e6, 3),
+                    "periods": round((a1 - a0) / ref, 1),
+                    "tags": reasons or ["unexplained"],
+                })
+
+        jitter = stats["jitter_us"]
+        result.update({
+            "period_us": None if stats["period_ns"] is None else round(stats["period_ns"] / 1000.0, 3),
+            "lateness_us": _trace_summary(stats["lateness_us"]),
+            "jitter_us": _trace_summary(jitter),
+            "jitter_histogram_us": _trace_histogram(np.abs(jitter) if np is not None else [abs(v) for v in jitter]),
+            "cps": stats["cps"],
+            "stall_count": len(stats["stalls"]),
+            "stall_tags": dict(tags),
+            "stalls": stalls,
+        })
+    return report
+
+
+def format_trace_report(report, max_rows=ANALYZE_MAX_ROWS):
+    lines = [
+        f"Trace {report['path']} | records={report['records']} overwritten={report['overwritten']} engine={report['engine']}",
+    ]
+    if not report["records"]:
+        lines.append("No records")
+        return "\n".join(lines)
+
+    lines.append(f"Span {report['span_s']:.3f}s | " + " ".join(f"{k}={n}" for k, n in report["kinds"].items()))
+    lines.append(f"Config changes {report['config_changes']} | blocked periods {report['blocked_periods']} ({report['blocked_s']:.3f}s)")
+
+    for ch in report["channels"]:
+        lines.append("")
+        lines.append(f"Channel {ch['channel']} | emits={ch['emits']} inputs={ch['inputs']} period={ch.get('period_us')}us")
+        if "jitter_us" not in ch:
+            continue
+        for label in ("lateness_us", "jitter_us"):
+            s = ch[label]
+            if s is not None:
+                lines.append(f"  {label:<12} p50={s['p50']:.3f} p95={s['p95']:.3f} p99={s['p99']:.3f} max={s['max']:.3f}")
+
+        lines.append("  |jitter| histogram (us)")
+        peak = max(n for _lo, _hi, n in ch["jitter_histogram_us"])
+        for lo, hi, n in ch["jitter_histogram_us"]:
+            label = f"{lo:g}-{hi:g}" if hi is not None else f">={lo:g}"
+            lines.append(f"    {label:>16} {n:>10} {'#' * max(1, round(40 * n / peak))}")
+
+        cps = ch["cps"]
+        lines.append(f"  CPS per window (achieved / target){'' if len(cps) <= max_rows else f', first {max_rows} of {len(cps)}'}")
+        for t, achieved, target in cps[:max_rows]:
+            target_text = "-" if target is None else f"{target:.1f}"
+            lines.append(f"    t={t:>9.3f}s {achieved:>12.1f} / {target_text}")
+
+        tags = " ".join(f"{k}={n}" for k, n in sorted(ch["stall_tags"].items()))
+        lines.append(f"  Stalls {ch['stall_count']}{' | ' + tags if tags else ''}")
+        for stall in ch["stalls"]:
+            lines.append(f"    t={stall['t_s']:>9.3f}s {stall['duration_ms']:>10.3f}ms {stall['periods']:>8.1f} periods {','.join(stall['tags'])}")
+    return "\n".join(lines)
+
+
+def analyze_main(argv):
+    parser = argparse.ArgumentParser(prog="clicker.py analyze", description="Summarize a binary click trace.")
+    parser.add_argument("trace", help="Trace file written by the trace dump.")
+    parser.add_argument("--gap-periods", type=float, default=ANALYZE_GAP_PERIODS, help="Report intervals longer than this many target periods as stalls.")
+    parser.add_argument("--window", type=float, default=ANALYZE_WINDOW_S, help="Seconds per achieved-vs-target CPS window.")
+    parser.add_argument("--max-rows", type=int, default=ANALYZE_MAX_ROWS, help="Rows to list per table.")
+    parser.add_argument("--json", action="store_true", help="Print the full report as JSON.")
+    args = parser.parse_args(argv)
+
+    if args.gap_periods <= 0 or args.window <= 0:
+        parser.error("--gap-periods and --window must be positive")
 
-    cfg = default_config()
     try:
-        CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-        if CONFIG_PATH.exists():
-            loaded = json.loads(CONFIG_PATH.read_text(encoding="utf-8"))
-            if isinstance(loaded, dict):
-                for k, v in loaded.items():
-                    if k in cfg:
-                        cfg[k] = v
-    except Exception as e:
-        logger.debug("Startup config read failed: %s", e)
+        report = analyze_trace(args.trace, args.gap_periods, args.window, args.max_rows)
+    except (OSError, ValueError) as e:
+        print(f"analyze: {e}", file=sys.stderr)
+        return 1
+
+    print(json.dumps(report, indent=2) if args.json else format_trace_report(report, args.max_rows))
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="clicker.py", description=APP_NAME)
+    parser.add_argument("--headless", action="store_true", help="Run the hotkeys and clicker without the window.")
+    parser.add_argument("--profile", default="", help="Saved profile to activate on start (with --headless).")
+    parser.add_argument("--profile-startup", action="store_true", help="Log a per-phase startup time breakdown.")
+    args = parser.parse_args(argv)
+    startup.mark("imports")
+
+    setup_logger(use_rich=not args.headless)
+    logger.info("Launching %s%s", APP_NAME, " (headless)" if args.headless else "")
+    startup.mark("logger")
+
+    cfg = load_config()
+    startup.mark("config")
 
     want_elev = bool(cfg.get("elevate_on_start", False))
     try:
@@ -1793,8 +4682,10 @@ def main():
         is_admin = False
 
     if want_elev and not is_admin:
-        exe, args = self_launch_command()
-        params = subprocess.list2cmdline(args)
+        from subprocess import list2cmdline
+
+        exe, launch_args = self_launch_command()
+        params = list2cmdline(launch_args)
 
         logger.info("Elevate-on-start enabled; requesting UAC relaunch")
         ctypes.set_last_error(0)
@@ -1817,25 +4708,40 @@ def main():
         else:
             return None, None
 
-    WinTimer.begin(1)
+    if args.headless:
+        app = HeadlessClicker(cfg)
+        ok, result = app.start(args.profile)
+        if not ok:
+            logger.error("Headless start failed: %s", result)
+            app._on_close()
+            return None, None
+        if args.profile_startup:
+            logger.info("Startup profile | %s", startup.summary())
+        return None, app
 
-    root = tk.Tk()
-    return root, AutoClickerApp(root)
+    root = load_tk().Tk()
+    startup.mark("tk")
+    app = AutoClickerApp(root, cfg)
+    if args.profile_startup:
+        root.update()
+        startup.mark("first paint")
+        logger.info("Startup profile | %s", startup.summary())
+    return root, app
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "analyze":
+        raise SystemExit(analyze_main(sys.argv[2:]))
+
     root = None
     app = None
-    timer_started = False
     try:
         root, app = main()
         if root is not None:
-            timer_started = True
             root.mainloop()
+        elif app is not None:
+            app.run()
     except KeyboardInterrupt:
         logger.info("Interrupted by user, exiting")
         if app is not None:
             app._on_close()
-    finally:
-        if timer_started:
-            WinTimer.end(1)
@@ -0,0 +1,34 @@
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import benchmark_clicker
+import clicker
+
+
+@pytest.fixture(params=["numpy", "python"])
+def engine(request, monkeypatch):
+    if request.param == "numpy":
+        if clicker.load_numpy() is None:
+            pytest.skip("numpy not installed")
+    else:
+        monkeypatch.setattr(clicker, "np", None)
+        monkeypatch.setattr(clicker, "_numpy_tried", True)
+    return request.param
+
+
+@pytest.fixture
+def make_config():
+    return benchmark_clicker.base_config
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        if time.perf_counter() > deadline:
+            raise AssertionError("condition not met in time")
+        time.sleep(0.005)
@@ -0,0 +1,97 @@
+import json
+import time
+
+import clicker
+
+
+PERIOD_NS = 1_000_000
+
+
+def dump_emits(path, emits, capacity=1 << 16, events=()):
+    ring = clicker.TraceRing(capacity, enabled=True)
+    base = time.perf_counter_ns() - 60 * 10**9
+    for t, kind in events:
+        ring.record(kind)
+        ring.ts[(ring.head - 1) & ring._mask] = base + t
+    for i in range(emits):
+        scheduled = base + i * PERIOD_NS
+        if i >= emits // 2:
+            scheduled += 20 * PERIOD_NS
+        ring.record(clicker.TRACE_EMIT, 0x1, scheduled, scheduled + 10_000)
+    ring.dump(path)
+    return ring
+
+
+def test_read_trace_round_trip(tmp_path, engine):
+    path = tmp_path / "trace.bin"
+    dump_emits(path, 100)
+    header, columns = clicker.read_trace(path)
+    assert header["records"] == 100
+    assert header["overwritten"] == 0
+    assert list(columns["kind"]) == [clicker.TRACE_EMIT] * 100
+    assert columns["actual"][1] - columns["actual"][0] == PERIOD_NS
+
+
+def test_read_trace_rejects_other_files(tmp_path):
+    path = tmp_path / "trace.bin"
+    path.write_bytes(b"not a trace" * 10)
+    try:
+        clicker.read_trace(path)
+    except ValueError as e:
+        assert "not a trace" in str(e)
+    else:
+        raise AssertionError("expected ValueError")
+
+
+def test_analyze_reports_rate_and_stall(tmp_path, engine):
+    path = tmp_path / "trace.bin"
+    dump_emits(path, 2000)
+    report = clicker.analyze_trace(path, gap_periods=4.0)
+    channel = report["channels"][0]
+    assert report["engine"] == engine
+    assert channel["emits"] == 2000
+    assert channel["period_us"] == 1000.0
+    assert channel["stall_count"] == 1
+    assert channel["stalls"][0]["tags"] == ["unexplained"]
+    assert channel["stalls"][0]["periods"] == 21.0
+    assert channel["cps"][0][1] == 1000.0
+    assert channel["cps"][0][2] == 1000.0
+
+
+def test_analyze_tags_blocked_stall(tmp_path, engine):
+    path = tmp_path / "trace.bin"
+    events = [(1000 * PERIOD_NS, clicker.TRACE_BLOCKED), (1015 * PERIOD_NS, clicker.TRACE_UNBLOCKED)]
+    dump_emits(path, 2000, events=events)
+    report = clicker.analyze_trace(path)
+    assert report["blocked_periods"] == 1
+    assert report["channels"][0]["stall_tags"] == {"blocked": 1}
+
+
+def test_analyze_wrapped_ring(tmp_path, engine, capsys):
+    path = tmp_path / "wrap.bin"
+    ring = dump_emits(path, 3000, capacity=1024)
+    assert ring.head > ring.capacity
+
+    report = clicker.analyze_trace(path)
+    assert report["records"] == 1024
+    assert report["overwritten"] == 3000 - 1024
+    channel = report["channels"][0]
+    assert channel["emits"] == 1024
+    assert all(row[0] >= 0 for row in channel["cps"])
+    assert sum(row[1] for row in channel["cps"]) == 1024
+
+    assert clicker.analyze_main([str(path), "--json"]) == 0
+    assert json.loads(capsys.readouterr().out)["records"] == 1024
+
+
+def test_analyze_engines_agree(tmp_path, monkeypatch):
+    if clicker.load_numpy() is None:
+        return
+    path = tmp_path / "trace.bin"
+    dump_emits(path, 3000, capacity=1024)
+    with_numpy = clicker.analyze_trace(path)
+    monkeypatch.setattr(clicker, "np", None)
+    monkeypatch.setattr(clicker, "_numpy_tried", True)
+    without_numpy = clicker.analyze_trace(path)
+    for key in ("emits", "inputs", "period_us", "stall_count", "stall_tags", "stalls", "cps", "jitter_histogram_us"):
+        assert with_numpy["channels"][0][key] == without_numpy["channels"][0][key]
@@ -0,0 +1,130 @@
+import json
+import queue
+import time
+
+import pytest
+
+import clicker
+from conftest import wait_for
+
+
+F2 = {"name": "f2", "scan_code": 0x3C, "vk_code": 0x71}
+
+
+@pytest.mark.parametrize(
+    "channels, error",
+    [
+        (["x"], "Channel 1 must be an object"),
+        ([5], "Channel 1 must be an object"),
+        ([{"start_bind": 5}], "Start bind is malformed"),
+        ([{"start_bind": {"scan_code": "x"}}], "Start bind is malformed"),
+        ([{"start_bind": dict(F2), "output_key": []}], "Output key is malformed"),
+        ("x", "Channels must be a list"),
+        (5, "Channels must be a list"),
+    ],
+)
+def test_malformed_channels_are_invalid(make_config, channels, error):
+    backend = clicker.HeadlessInputBackend()
+    for cfg in (make_config(channels=channels), clicker.ConfigSnapshot(make_config(channels=channels))):
+        runtime = clicker.build_runtime_plan(cfg, backend)
+        assert not runtime.ok
+        assert error in runtime.error
+
+
+@pytest.mark.parametrize("channels", [["x"], [5], [{"start_bind": 5}], [{"start_bind": {"scan_code": "x"}}], "x", 5])
+def test_hotkey_table_skips_malformed_channels(make_config, channels):
+    for cfg in (make_config(channels=channels), clicker.ConfigSnapshot(make_config(channels=channels))):
+        table = clicker.build_hotkey_table(cfg, {"good": 0x3D, "bad": "x"})
+        assert set(table) == {0x3B, 0x3D}
+
+
+def test_hotkey_table_keeps_valid_channel_next_to_malformed_one(make_config):
+    cfg = make_config(channels=["x", {"start_bind": dict(F2), "toggle_mode": "toggle"}])
+    table = clicker.build_hotkey_table(cfg)
+    assert table[0x3C] == (clicker.HOTKEY_CHANNEL_TOGGLE, None, True, 2)
+
+
+def test_worker_survives_config_getter_errors():
+    backend = clicker.HeadlessInputBackend()
+    ui_queue = queue.Queue()
+    worker = clicker.ClickerWorker(lambda: 1 / 0, ui_queue, backend=backend)
+    try:
+        worker.set_active(True, "test")
+        wait_for(lambda: not worker.active_channels)
+        time.sleep(0.02)
+        assert worker.thread.is_alive()
+    finally:
+        worker.close()
+    statuses = [item[1] for item in list(ui_queue.queue) if item[0] == "status"]
+    assert any(text.startswith("Config error") for text in statuses)
+
+
+def test_hotkeys_rebuild_only_when_a_hotkey_value_changes(make_config):
+    app = object.__new__(clicker.AutoClickerApp)
+    app.config_write_lock = clicker.threading.Lock()
+    app.config_snapshot = clicker.ConfigSnapshot(make_config())
+    rebuilds = []
+    app._rebuild_hotkeys = lambda: rebuilds.append(app.config_snapshot.version)
+    toggle_mode = app.config_snapshot.get("toggle_mode")
+
+    app._update_config(static_cps="20", toggle_mode=toggle_mode)
+    app._update_config(static_cps="21", toggle_mode=toggle_mode, start_bind=make_config()["start_bind"])
+    assert rebuilds == []
+
+    app._update_config(static_cps="22", start_bind=dict(F2))
+    assert rebuilds == [3]
+
+
+@pytest.fixture
+def persister(monkeypatch, tmp_path):
+    monkeypatch.setattr(clicker, "CONFIG_SAVE_DEBOUNCE_S", 0.05)
+    monkeypatch.setattr(clicker, "CONFIG_SAVE_MIN_INTERVAL_S", 0.3)
+    data = {"static_cps": "10"}
+    persister = clicker.ConfigPersister(tmp_path / "config.json", lambda: dict(data))
+    yield persister, data
+    persister.close()
+
+
+def saved(persister):
+    return json.loads(persister.path.read_text(encoding="utf-8"))
+
+
+def test_persister_coalesces_a_burst_into_one_write(persister):
+    persister, data = persister
+    for cps in range(20):
+        data["static_cps"] = str(cps)
+        persister.request_save()
+    assert not persister.path.exists()
+    wait_for(lambda: persister.writes)
+    time.sleep(0.1)
+    assert persister.writes == 1
+    assert saved(persister) == {"static_cps": "19"}
+
+
+def test_persister_skips_unchanged_data(persister):
+    persister, data = persister
+    persister.mark_saved(data)
+    persister.request_save()
+    wait_for(lambda: persister.skipped)
+    assert persister.writes == 0
+    assert not persister.path.exists()
+
+
+def test_persister_spaces_writes_by_min_interval(persister):
+    persister, data = persister
+    persister.request_save()
+    wait_for(lambda: persister.writes)
+    first = time.monotonic()
+    data["static_cps"] = "20"
+    persister.request_save()
+    wait_for(lambda: persister.writes == 2)
+    assert time.monotonic() - first >= 0.25
+    assert saved(persister) == {"static_cps": "20"}
+
+
+def test_persister_close_flushes_pending_save(persister):
+    persister, data = persister
+    persister.request_save()
+    persister.close()
+    assert persister.writes == 1
+    assert saved(persister) == data
@@ -0,0 +1,45 @@
+import threading
+
+import pytest
+
+import clicker
+
+
+@pytest.fixture
+def headless(monkeypatch, tmp_path, make_config):
+    monkeypatch.setattr(clicker, "PROFILES_DIR", tmp_path / "profiles")
+    return lambda: clicker.HeadlessClicker(make_config())
+
+
+def test_switch_profile_swaps_snapshot_and_plan(headless):
+    app = headless()
+    try:
+        cfg = app.config_snapshot.to_dict()
+        cfg["static_cps"] = "40"
+        cfg["code_display"] = "ignored"
+        _snapshot, plan = app.profiles.save("fast", cfg)
+        version = app.config_snapshot.version
+
+        assert app._switch_profile("fast")
+        assert not app._switch_profile("fast")
+        assert not app._switch_profile("missing")
+        assert app.config_snapshot.get("profile_name") == "fast"
+        assert app.config_snapshot.get("static_cps") == "40"
+        assert app.config_snapshot.get("code_display") == clicker.default_config()["code_display"]
+        assert app.config_snapshot.version == version + 1
+        assert app._build_runtime_config() is plan
+        assert app.ui_queue.get_nowait()[:2] == ("status", "Profile load failed: missing")
+    finally:
+        app._on_close()
+
+
+def test_run_blocks_until_close(headless):
+    app = headless()
+    runner = threading.Thread(target=app.run, daemon=True)
+    runner.start()
+    app.ui_queue.put(("status", "hello", "info"))
+    runner.join(0.2)
+    assert runner.is_alive()
+    app._on_close()
+    runner.join(2)
+    assert not runner.is_alive()
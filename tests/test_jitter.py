@@ -0,0 +1,45 @@
+import statistics
+
+import pytest
+
+import clicker
+
+
+def cps_samples(base, var, ticks=4000):
+    return [1.0 / p for p in clicker.JitterEngine(base, var, "lognormal").generate(ticks)]
+
+
+def achieved_cps(periods):
+    return len(periods) / sum(periods)
+
+
+def test_lognormal_is_centred_on_target_cps(engine):
+    for base, var in ((10.0, 8.0), (10.0, 20.0), (100.0, 30.0)):
+        periods = clicker.JitterEngine(base, var, "lognormal").generate(20000)
+        assert achieved_cps(periods) == pytest.approx(base, rel=0.03)
+
+
+def test_lognormal_skews_toward_faster_clicks(engine):
+    for base, var in ((10.0, 8.0), (100.0, 30.0)):
+        values = cps_samples(base, var)
+        low, *_, high = statistics.quantiles(values, n=10)
+        median = statistics.median(values)
+        assert high - median > median - low
+
+
+def test_lognormal_stays_within_variance(engine):
+    for base, var in ((10.0, 8.0), (12.0, 1.0), (5.0, 20.0)):
+        values = cps_samples(base, var, ticks=2000)
+        assert max(values) <= base + var + 1e-9
+        assert min(values) >= max(0.001, base - var) - 1e-9
+
+
+def test_default_plan_and_first_chunk_skip_numpy(monkeypatch, make_config):
+    monkeypatch.setattr(clicker, "np", None)
+    monkeypatch.setattr(clicker, "_numpy_tried", False)
+    cfg = make_config()
+    runtime = clicker.build_runtime_plan(cfg, clicker.HeadlessInputBackend())
+    assert runtime.ok, runtime.error
+    engine = clicker.JitterEngine(float(cfg["static_cps"]), float(cfg["static_variance"]), cfg["variance_mode"])
+    engine.generate(clicker.JITTER_FIRST_CHUNK_CLICKS // engine.clicks_per_tick)
+    assert not clicker._numpy_tried
@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+import clicker
+
+
+F2 = {"name": "f2", "scan_code": 0x3C, "vk_code": 0x71}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return lambda: clicker.ProfileStore(tmp_path / "profiles", clicker.HeadlessInputBackend())
+
+
+def test_save_and_load_round_trip(store, make_config):
+    profiles = store()
+    snapshot, plan = profiles.save("fast", make_config(static_cps="40", profile_bind=dict(F2), code_display="hex"))
+    assert plan.ok, plan.error
+
+    on_disk = json.loads(profiles.path_for("fast").read_text(encoding="utf-8"))
+    assert on_disk["static_cps"] == "40"
+    assert on_disk["profile_name"] == "fast"
+    assert not set(clicker.PROFILE_GLOBAL_KEYS) & set(on_disk)
+
+    loaded, loaded_plan = store().load("fast")
+    assert loaded.to_dict() == {**snapshot.to_dict(), "code_display": clicker.default_config()["code_display"]}
+    assert loaded_plan.ok
+    assert loaded.get("static_cps") == "40"
+
+
+def test_load_is_cached_and_unchanged_save_skips_write(store, make_config):
+    profiles = store()
+    entry = profiles.save("fast", make_config(static_cps="40"))
+    path = profiles.path_for("fast")
+    path.write_text("{}", encoding="utf-8")
+    assert profiles.load("fast") is entry
+    assert profiles.save("fast", make_config(static_cps="40")) is entry
+    assert path.read_text(encoding="utf-8") == "{}"
+
+
+def test_index_tracks_binds_across_instances(store, make_config):
+    profiles = store()
+    profiles.save("fast", make_config(profile_bind=dict(F2)))
+    profiles.save("slow", make_config())
+    assert profiles.binds() == {"fast": F2["scan_code"], "slow": None}
+
+    reopened = store()
+    assert reopened.binds() == {"fast": F2["scan_code"], "slow": None}
+    assert reopened.names() == ["fast", "slow"]
+
+    assert reopened.delete("slow")
+    assert not reopened.delete("slow")
+    assert not reopened.path_for("slow").exists()
+    assert store().binds() == {"fast": F2["scan_code"]}
+
+
+def test_missing_index_is_rebuilt_from_profile_files(store, make_config):
+    profiles = store()
+    profiles.save("fast", make_config(profile_bind=dict(F2)))
+    profiles.index_path.unlink()
+    assert store().binds() == {"fast": None}
+
+
+def test_rejects_invalid_names(store):
+    profiles = store()
+    for name in ("", "../escape", ".hidden", "x" * 41):
+        assert not profiles.valid_name(name)
+        with pytest.raises(ValueError):
+            profiles.path_for(name)
+    assert profiles.valid_name("Boss fight 2.1")
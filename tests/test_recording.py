@@ -0,0 +1,231 @@
+import queue
+import time
+
+import pytest
+
+import clicker
+from conftest import wait_for
+
+
+SHIFT = 0x2A
+MS = 1_000_000
+
+
+def write_recording(path, items, compress=None):
+    writer = clicker.RecordingWriter(path, compress)
+    writer.write(items)
+    writer.close()
+    return writer
+
+
+@pytest.fixture
+def playback_worker(make_config):
+    def start(path, block=None):
+        backend = clicker.HeadlessInputBackend()
+        runtime = clicker.build_runtime_plan(make_config(output_mode="playback", playback_file=str(path)), backend)
+        assert runtime.ok, runtime.error
+        worker = clicker.ClickerWorker(lambda: runtime, queue.Queue(), block_click_check=block, backend=backend)
+        wait_for(lambda: worker.scheduler.calibrations)
+        return worker, backend
+
+    return start
+
+
+def held_shift_recording(path):
+    write_recording(path, [
+        (0, clicker.EVENT_KEY_DOWN, SHIFT, 0, 0),
+        (500 * MS, clicker.EVENT_KEY_UP, SHIFT, 0, 0),
+        (510 * MS, clicker.EVENT_KEY_DOWN, 0x1E, 0, 0),
+        (520 * MS, clicker.EVENT_KEY_UP, 0x1E, 0, 0),
+    ])
+
+
+def test_writer_is_uncompressed_by_default(tmp_path):
+    path = tmp_path / "plain.tbrec"
+    assert not write_recording(path, [(0, clicker.EVENT_KEY_DOWN, SHIFT, 0, 0)]).compressed
+    reader = clicker.RecordingReader(path)
+    try:
+        assert not reader.compressed
+        assert reader._mmap is not None
+    finally:
+        reader.close()
+
+
+def test_stop_releases_held_key_and_closes_file(tmp_path, playback_worker):
+    path = tmp_path / "held.tbrec"
+    held_shift_recording(path)
+    worker, backend = playback_worker(path)
+    worker.set_active(True, "test")
+    wait_for(lambda: backend.events)
+    cursor = worker._channel_state[0][3]
+    worker.set_active(False, "test")
+    wait_for(lambda: not worker._channel_state)
+    worker.close()
+
+    assert [k for _t, k, a, _b in backend.take_events() if a == SHIFT] == [clicker.EVENT_KEY_DOWN, clicker.EVENT_KEY_UP]
+    assert cursor.reader._file.closed
+    assert cursor.reader._mmap is None
+
+
+def test_nudge_keeps_playback_position(tmp_path, playback_worker):
+    path = tmp_path / "held.tbrec"
+    held_shift_recording(path)
+    worker, backend = playback_worker(path)
+    worker.set_active(True, "test")
+    wait_for(lambda: backend.events)
+    cursor = worker._channel_state[0][3]
+    worker.nudge()
+    wait_for(lambda: not worker.runtime_dirty.is_set())
+    time.sleep(0.02)
+    assert worker._channel_state[0][3] is cursor
+    worker.close()
+    assert [k for _t, k, a, _b in backend.take_events() if a == SHIFT] == [clicker.EVENT_KEY_DOWN, clicker.EVENT_KEY_UP]
+
+
+def test_block_releases_and_resumes_in_place(tmp_path, playback_worker):
+    path = tmp_path / "held.tbrec"
+    held_shift_recording(path)
+    blocked = [False]
+    worker, backend = playback_worker(path, block=lambda: blocked[0])
+    worker.set_active(True, "test")
+    wait_for(lambda: backend.events)
+    blocked[0] = True
+    wait_for(lambda: len(backend.events) == 2)
+    assert [k for _t, k, a, _b in backend.take_events() if a == SHIFT] == [clicker.EVENT_KEY_DOWN, clicker.EVENT_KEY_UP]
+
+    blocked[0] = False
+    wait_for(lambda: len(backend.events) >= 3)
+    worker.set_active(False, "test")
+    wait_for(lambda: not worker._channel_state)
+    worker.close()
+    events = backend.take_events()
+    assert [k for _t, k, a, _b in events if a == SHIFT][:1] == [clicker.EVENT_KEY_UP]
+    assert [k for _t, k, a, _b in events if a == 0x1E][:2] == [clicker.EVENT_KEY_DOWN, clicker.EVENT_KEY_UP]
+
+
+def read_back(path):
+    reader = clicker.RecordingReader(path)
+    try:
+        return list(reader.records()), [record[1] for record in reader.raw_records()]
+    finally:
+        reader.close()
+
+
+def sample_items(count=5000):
+    items = []
+    for i in range(count):
+        kind = (clicker.EVENT_MOVE, clicker.EVENT_MOUSE_DOWN, clicker.EVENT_MOUSE_UP, clicker.EVENT_KEY_DOWN)[i % 4]
+        code = 0 if kind == clicker.EVENT_MOVE else i % 200
+        items.append((10 * MS + i * 1500 * 1000, kind, code, i - 2000, -i))
+    return items
+
+
+def expected_records(items):
+    start = items[0][0] // 1000
+    return [(t // 1000 - start, kind, code, x, y) for t, kind, code, x, y in items]
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_round_trip(tmp_path, compress):
+    if compress and clicker.zstandard is None:
+        pytest.skip("zstandard is not installed")
+    path = tmp_path / "round.tbrec"
+    items = sample_items()
+    writer = write_recording(path, items, compress)
+    assert writer.compressed == compress
+    assert writer.records == len(items)
+    assert clicker.RecordingReader.read_header(path)[2] == (clicker.RECORDING_FLAG_ZSTD if compress else 0)
+    records, _ = read_back(path)
+    assert records == expected_records(items)
+
+
+def test_compressed_is_refused_without_zstandard(tmp_path, monkeypatch):
+    monkeypatch.setattr(clicker, "zstandard", None)
+    with pytest.raises(RuntimeError):
+        clicker.RecordingWriter(tmp_path / "z.tbrec", compress=True)
+
+
+def test_long_gaps_are_padded(tmp_path, monkeypatch):
+    monkeypatch.setattr(clicker, "RECORDING_MAX_DELTA_US", 1000)
+    path = tmp_path / "gaps.tbrec"
+    items = [
+        (0, clicker.EVENT_KEY_DOWN, SHIFT, 0, 0),
+        (3500 * 1000, clicker.EVENT_KEY_UP, SHIFT, 0, 0),
+        (3000 * 1000, clicker.EVENT_KEY_DOWN, 0x1E, 0, 0),
+    ]
+    writer = write_recording(path, items)
+    assert writer.records == 6
+    records, kinds = read_back(path)
+    assert kinds.count(clicker.RECORDING_PAD) == 3
+    assert [r[0] for r in records] == [0, 3500, 3500]
+
+
+def test_rejects_non_recordings(tmp_path):
+    path = tmp_path / "junk.tbrec"
+    path.write_bytes(b"TBACREC")
+    with pytest.raises(ValueError, match="too short"):
+        clicker.RecordingReader(path)
+    path.write_bytes(b"X" * clicker.RECORDING_HEADER.size)
+    with pytest.raises(ValueError, match="bad magic"):
+        clicker.RecordingReader(path)
+
+
+def cursor_for(tmp_path, items):
+    path = tmp_path / "batch.tbrec"
+    write_recording(path, items)
+    backend = clicker.HeadlessInputBackend()
+    return clicker.PlaybackCursor(path, backend), backend
+
+
+def test_playback_batches_within_window(tmp_path):
+    window = clicker.PLAYBACK_BATCH_WINDOW_US * 1000
+    cursor, backend = cursor_for(tmp_path, [
+        (0, clicker.EVENT_MOUSE_DOWN, 1, 0, 0),
+        (window // 2, clicker.EVENT_MOVE, 0, 40, 50),
+        (window, clicker.EVENT_MOUSE_UP, 1, 0, 0),
+        (window + 4 * MS, clicker.EVENT_KEY_DOWN, 0x1E, 0, 0),
+    ])
+    try:
+        assert cursor.batch == [
+            (clicker.EVENT_MOUSE_DOWN, 1, 0),
+            (clicker.EVENT_MOVE, 40, 50),
+            (clicker.EVENT_MOUSE_UP, 1, 0),
+        ]
+        assert cursor(0) == pytest.approx(window / 1e9 + 0.004)
+        cursor.emit()
+        assert cursor.batch == [(clicker.EVENT_KEY_DOWN, 0x1E, 0)]
+        assert cursor(0) == clicker.PLAYBACK_REPEAT_GAP_S
+        cursor.emit()
+        assert cursor.batch[0] == (clicker.EVENT_MOUSE_DOWN, 1, 0)
+        assert [e[1:] for e in backend.take_events()] == [
+            (clicker.EVENT_MOUSE_DOWN, 1, 0),
+            (clicker.EVENT_MOVE, 40, 50),
+            (clicker.EVENT_MOUSE_UP, 1, 0),
+            (clicker.EVENT_KEY_DOWN, 0x1E, 0),
+        ]
+    finally:
+        cursor.close()
+    assert [e[1:] for e in backend.take_events()] == [(clicker.EVENT_KEY_UP, 0x1E, 0)]
+
+
+def test_playback_caps_batch_size(tmp_path, monkeypatch):
+    monkeypatch.setattr(clicker, "PLAYBACK_MAX_BATCH", 2)
+    cursor, _ = cursor_for(tmp_path, [(i * 10_000, clicker.EVENT_MOVE, 0, i, i) for i in range(5)])
+    try:
+        sizes = []
+        gaps = []
+        for _ in range(3):
+            sizes.append(len(cursor.batch))
+            gaps.append(cursor(0))
+            cursor.emit()
+        assert sizes == [2, 2, 1]
+        assert gaps == pytest.approx([0.00002, 0.00002, clicker.PLAYBACK_REPEAT_GAP_S])
+    finally:
+        cursor.close()
+
+
+def test_playback_rejects_empty_recording(tmp_path):
+    path = tmp_path / "empty.tbrec"
+    write_recording(path, [])
+    with pytest.raises(ValueError, match="has no events"):
+        clicker.PlaybackCursor(path, clicker.HeadlessInputBackend())
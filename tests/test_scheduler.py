@@ -0,0 +1,76 @@
+import queue
+import types
+
+import clicker
+from conftest import wait_for
+
+
+def fake_winmm(monkeypatch):
+    calls = []
+    winmm = types.SimpleNamespace(
+        timeBeginPeriod=lambda ms: calls.append(("begin", ms)) or 0,
+        timeEndPeriod=lambda ms: calls.append(("end", ms)) or 0,
+    )
+    monkeypatch.setattr(clicker.WinTimer, "winmm", winmm)
+    return calls
+
+
+def test_resolution_switch_keeps_each_calibration(monkeypatch):
+    fake_winmm(monkeypatch)
+    scheduler = clicker.HybridScheduler()
+    scheduler.calibrate(samples=4)
+    released = scheduler.spin_threshold_s
+    window = scheduler._overshoots
+
+    scheduler.use_timer_resolution(True)
+    assert scheduler.calibrations == 2
+    held = scheduler.spin_threshold_s
+
+    scheduler.use_timer_resolution(False)
+    assert scheduler.spin_threshold_s == released
+    assert scheduler._overshoots is window
+
+    scheduler.use_timer_resolution(True)
+    assert scheduler.spin_threshold_s == held
+    assert scheduler.calibrations == 2
+
+
+def test_resolution_switch_is_a_no_op_without_winmm(monkeypatch):
+    monkeypatch.setattr(clicker.WinTimer, "winmm", None)
+    scheduler = clicker.HybridScheduler()
+    scheduler.calibrate(samples=4)
+    threshold = scheduler.spin_threshold_s
+    scheduler.use_timer_resolution(True)
+    assert not scheduler.timer_resolution
+    assert scheduler.spin_threshold_s == threshold
+    assert scheduler.calibrations == 1
+
+
+def test_activation_uses_calibrated_threshold(monkeypatch, make_config):
+    calls = fake_winmm(monkeypatch)
+    backend = clicker.HeadlessInputBackend()
+    runtime = clicker.build_runtime_plan(make_config(static_cps="100", static_variance="0"), backend)
+    worker = clicker.ClickerWorker(lambda: runtime, queue.Queue(), backend=backend)
+    try:
+        wait_for(lambda: worker.scheduler.calibrations == 2 and not worker.scheduler.timer_resolution)
+        calibrations = worker.scheduler.calibrations
+        worker.set_active(True, "test")
+        wait_for(lambda: backend.events)
+        assert worker.scheduler.timer_resolution
+        assert worker.scheduler.calibrations == calibrations
+        assert worker.scheduler._overshoots
+    finally:
+        worker.close()
+    assert calls[:2] == [("begin", 1), ("end", 1)]
+
+
+def test_calibration_probes_the_event_wait_it_sleeps_on(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(clicker.time, "sleep", lambda s: sleeps.append(s))
+    scheduler = clicker.HybridScheduler()
+    scheduler.calibrate(samples=4)
+    deadline = clicker.time.perf_counter() + scheduler.spin_threshold_s + 0.005
+    scheduler.wait_until(deadline, lambda: False)
+    assert scheduler.calibrations == 1
+    assert len(scheduler._overshoots) == 5
+    assert not [s for s in sleeps if s > 0]
@@ -0,0 +1,163 @@
+import queue
+import time
+import types
+
+import pytest
+
+import clicker
+from conftest import wait_for
+
+
+SHIFT = 0x2A
+
+
+@pytest.fixture
+def script_config(make_config):
+    return lambda script: make_config(output_mode="sequence", sequence_script=script)
+
+
+def run_worker(cfg, run_s=0.1, block=None):
+    backend = clicker.HeadlessInputBackend()
+    runtime = clicker.build_runtime_plan(cfg, backend)
+    assert runtime.ok, runtime.error
+    worker = clicker.ClickerWorker(lambda: runtime, queue.Queue(), block_click_check=block, backend=backend)
+    wait_for(lambda: worker.scheduler.calibrations)
+    worker.set_active(True, "test")
+    wait_for(lambda: backend.events)
+    time.sleep(run_s)
+    return worker, backend
+
+
+def stop(worker):
+    worker.set_active(False, "test")
+    wait_for(lambda: not worker._channel_state)
+    worker.close()
+
+
+def kinds_for(backend, code):
+    return [kind for _t, kind, a, _b in backend.take_events() if a == code]
+
+
+def test_stop_during_wait_releases_held_key(script_config):
+    worker, backend = run_worker(script_config(f"down {SHIFT:#x}; wait 500; up {SHIFT:#x}; wait 10"))
+    stop(worker)
+    assert kinds_for(backend, SHIFT) == [clicker.EVENT_KEY_DOWN, clicker.EVENT_KEY_UP]
+
+
+def test_stop_during_wait_releases_held_button(script_config):
+    worker, backend = run_worker(script_config("mdown right; wait 500; mup right; wait 10"))
+    stop(worker)
+    assert kinds_for(backend, clicker.MOUSE_BUTTON_CODES["right"]) == [clicker.EVENT_MOUSE_DOWN, clicker.EVENT_MOUSE_UP]
+
+
+def test_no_release_when_nothing_is_held(script_config):
+    worker, backend = run_worker(script_config(f"tap {SHIFT:#x}; wait 500"))
+    stop(worker)
+    assert kinds_for(backend, SHIFT) == [clicker.EVENT_KEY_DOWN, clicker.EVENT_KEY_UP]
+
+
+def test_block_releases_and_resumes_in_place(script_config):
+    blocked = [False]
+    worker, backend = run_worker(script_config(f"down {SHIFT:#x}; wait 150; up {SHIFT:#x}; tap 0x1E; wait 10000"), run_s=0.0, block=lambda: blocked[0])
+    blocked[0] = True
+    wait_for(lambda: len(backend.events) == 2)
+    assert kinds_for(backend, SHIFT) == [clicker.EVENT_KEY_DOWN, clicker.EVENT_KEY_UP]
+    blocked[0] = False
+    wait_for(lambda: len(backend.events) == 3)
+    stop(worker)
+    events = backend.take_events()
+    assert [kind for _t, kind, a, _b in events if a == SHIFT] == [clicker.EVENT_KEY_UP]
+    assert [kind for _t, kind, a, _b in events if a == 0x1E] == [clicker.EVENT_KEY_DOWN, clicker.EVENT_KEY_UP]
+
+
+def compile_ok(script):
+    ok, timeline = clicker.compile_sequence(script, clicker.HeadlessInputBackend())
+    assert ok, timeline
+    return timeline
+
+
+@pytest.mark.parametrize("script, error", [
+    ("tap 0x1E; wait 10 }", "Unexpected }"),
+    ("tap 0x1E; { wait 10", "Unexpected {"),
+    ("loop 2 { tap 0x1E; wait 10", "Missing }"),
+    ("loop 2 tap 0x1E", "loop needs a { block }"),
+    ("loop 0 { tap 0x1E; wait 10 }", "Counts must be >= 1"),
+    ("hop 0x1E; wait 10", "Unknown command: hop"),
+    ("tap 0x1E; wait -5", "wait must be >= 0 ms"),
+    ("tap 0x1E; wait", "wait takes milliseconds"),
+    ("click middle2; wait 10", "Invalid mouse button: middle2"),
+    ("move 10; wait 10", "move needs x y"),
+])
+def test_parse_errors(script, error):
+    ok, message = clicker.compile_sequence(script, clicker.HeadlessInputBackend())
+    assert not ok
+    assert message == f"Sequence: {error}"
+
+
+def test_sequence_needs_events_and_a_wait():
+    backend = clicker.HeadlessInputBackend()
+    assert clicker.compile_sequence("wait 10 # nothing to send", backend) == (False, "Sequence has no input events")
+    assert clicker.compile_sequence("tap 0x1E; wait 0", backend) == (False, "Sequence needs at least one wait")
+
+
+def test_expansion_is_capped(monkeypatch):
+    monkeypatch.setattr(clicker, "SEQUENCE_MAX_EVENTS", 100)
+    ok, message = clicker.compile_sequence("loop 1000 { tap 0x1E; wait 1 }", clicker.HeadlessInputBackend())
+    assert not ok
+    assert message == "Sequence: expands past 100 steps"
+
+
+def test_loop_expansion():
+    timeline = compile_ok("loop 3 {\n  tap 0x1E\n  wait 10\n}\nclick right 2; move 5 -7\nwait 20")
+    right = clicker.MOUSE_BUTTON_CODES["right"]
+    assert timeline.event_count == 11
+    assert timeline.batch_count == 4
+    assert list(timeline.starts) == [0, 2, 4, 6, 11]
+    assert list(timeline.gaps) == pytest.approx([0.01, 0.01, 0.01, 0.02])
+    assert list(timeline.kinds[6:]) == [
+        clicker.EVENT_MOUSE_DOWN, clicker.EVENT_MOUSE_UP,
+        clicker.EVENT_MOUSE_DOWN, clicker.EVENT_MOUSE_UP,
+        clicker.EVENT_MOVE,
+    ]
+    assert list(timeline.arg_a[6:]) == [right, right, right, right, 5]
+    assert timeline.arg_b[10] == -7
+    assert timeline.min_gap == pytest.approx(0.01)
+    assert timeline.holds is None
+
+
+def test_leading_wait_becomes_empty_batch():
+    timeline = compile_ok("wait 5; loop 2 { wait 3 }; tap 0x1E; wait 10")
+    assert list(timeline.starts) == [0, 0, 2]
+    assert list(timeline.gaps) == pytest.approx([0.011, 0.01])
+
+
+def test_cursor_tracks_net_holds():
+    timeline = compile_ok(f"down {SHIFT:#x}; mdown left; wait 10; mup left; wait 10; up {SHIFT:#x}; wait 10")
+    cursor = clicker.SequenceCursor(timeline)
+    backend = timeline.backend
+    cursor.emit()
+    cursor.emit()
+    backend.take_events()
+    cursor.close()
+    assert [(kind, a) for _t, kind, a, _b in backend.take_events()] == [(clicker.EVENT_KEY_UP, SHIFT)]
+
+
+def compile_keys(script):
+    timeline = compile_ok(script)
+    return [a for kind, a in zip(timeline.kinds, timeline.arg_a) if kind == clicker.EVENT_KEY_DOWN]
+
+
+def test_key_names_win_over_numbers(monkeypatch):
+    names = {"1": [2], "9": [10], "esc": [1]}
+    fake = types.SimpleNamespace(key_to_scan_codes=lambda name: names[name])
+    monkeypatch.setattr(clicker, "keyboard", fake)
+    monkeypatch.setattr(clicker, "load_keyboard", lambda: fake)
+    assert compile_keys("tap 1; tap 9; tap ESC; tap 0x1E; wait 10") == [2, 10, 1, 0x1E]
+
+
+def test_raw_scan_codes_need_hex_prefix(monkeypatch):
+    monkeypatch.setattr(clicker, "load_keyboard", lambda: None)
+    assert compile_keys("tap 0x1E; down 0X2a; wait 10") == [0x1E, SHIFT]
+    backend = clicker.HeadlessInputBackend()
+    assert clicker.compile_sequence("tap 1; wait 10", backend) == (False, "Sequence: Unknown key: 1")
+    assert clicker.compile_sequence("tap 0xZZ; wait 10", backend) == (False, "Sequence: Unknown key: 0xZZ")